@@ -0,0 +1,776 @@
+from typing import Any, Dict, List, Optional, Union
+
+import asyncio
+import logging
+
+from ._service import POOL_MAXSIZE
+from ._service_base import (
+    SupabaseError,
+    SupabaseAuthError,
+    SupabaseAPIError,
+    SupabaseServiceBase,
+)
+
+try:
+    import httpx
+except ImportError:
+    raise ImportError(
+        "Could not import 'httpx'. The async Supabase service requires the "
+        "httpx package. Please install it using: pip install httpx[http2]"
+    )
+
+logger = logging.getLogger(" apps.supabase_home")
+
+
+class AsyncSupabaseService(SupabaseServiceBase):
+    """
+    Async counterpart of SupabaseService built on httpx.AsyncClient.
+
+    All requests share one AsyncClient with HTTP/2 and a keep-alive
+    connection pool, so concurrent calls multiplex onto pooled sockets
+    instead of blocking the event loop the way sync `requests` would.
+    Settings validation and header construction live in SupabaseServiceBase,
+    shared with the sync variant; this class adds the httpx backend.
+
+    Call `aclose()` on application shutdown to release the pool.
+    """
+
+    __slots__ = ("_client",)
+
+    def __init__(self):
+        super().__init__()
+
+        # One shared client: HTTP/2 + keep-alive pool for concurrent calls.
+        # Split timeouts fail fast on connect while tolerating slow reads.
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=POOL_MAXSIZE,
+                max_keepalive_connections=max(1, POOL_MAXSIZE // 2),
+            ),
+            timeout=httpx.Timeout(connect=3.0, read=27.0, write=10.0, pool=5.0),
+        )
+
+    async def aclose(self) -> None:
+        """
+        Close the shared HTTP client.
+
+        Call this from the application's shutdown hook to release
+        kept-alive connections.
+        """
+        await self._client.aclose()
+
+    async def _make_request(
+        self,
+        method: str,
+        endpoint: str,
+        auth_token: Optional[str] = None,
+        is_admin: bool = False,
+        data: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Make an async request to the Supabase API.
+
+        Args:
+            method: HTTP method (GET, POST, PUT, DELETE, etc.)
+            endpoint: API endpoint path
+            auth_token: Optional JWT token for authenticated requests
+            is_admin: Whether to use the service role key (admin access)
+            data: Optional request body data
+            params: Optional query parameters
+            headers: Optional additional headers
+            timeout: Optional request timeout in seconds; defaults to the
+                client's split connect/read/write/pool timeouts
+
+        Returns:
+            Response data as dictionary
+
+        Raises:
+            SupabaseAuthError: If there's an authentication error
+            SupabaseAPIError: If the API request fails
+            SupabaseError: For other Supabase-related errors
+            Exception: For unexpected errors
+        """
+        # Get default headers and merge with any additional headers
+        # (the defaults are a shared read-only mapping, so merge into a copy)
+        request_headers = self._get_headers(auth_token, is_admin)
+        if headers:
+            request_headers = {**request_headers, **headers}
+
+        # Supabase expects a valid JSON body (even if empty); _get_headers
+        # always sets an application/json Content-Type, so there is no need
+        # to re-check the header on every call
+        if data is None:
+            data = {}
+
+        try:
+            logger.debug("Making %s request to %s", method, endpoint)
+            response = await self._client.request(
+                method=method,
+                url=endpoint,
+                headers=request_headers,
+                json=data,
+                params=params,
+                timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+            )
+
+            # Handle different error scenarios
+            if response.status_code == 401 or response.status_code == 403:
+                error_detail = self._parse_error_response(response)
+                logger.error("Authentication error: %s", error_detail)
+                raise SupabaseAuthError(f"Authentication error: {error_detail}")
+
+            # Raise exception for other error status codes
+            response.raise_for_status()
+
+            # Return JSON response if available, otherwise return empty dict
+            if response.content:
+                return response.json()
+            return {}
+
+        except httpx.HTTPStatusError as e:
+            error_detail = self._parse_error_response(e.response)
+            logger.error("Supabase API error: %s - Details: %s", e, error_detail)
+            raise SupabaseAPIError(
+                message=f"Supabase API error: {str(e)}",
+                status_code=e.response.status_code,
+                details=error_detail,
+            )
+
+        except httpx.ConnectError as e:
+            logger.error("Supabase connection error: %s", e)
+            raise SupabaseError(
+                "Connection error: Unable to connect to Supabase API. Check your network connection and Supabase URL."
+            )
+
+        except httpx.TimeoutException as e:
+            logger.error("Supabase request timeout: %s", e)
+            raise SupabaseError(
+                f"Request timeout: The request to Supabase API timed out after {timeout} seconds."
+            )
+
+        except httpx.HTTPError as e:
+            logger.error("Supabase request exception: %s", e)
+            raise SupabaseError(f"Request error: {str(e)}")
+
+        # SupabaseAuthError/SupabaseAPIError raised above propagate as-is;
+        # anything truly unexpected keeps its type and traceback instead of
+        # being re-wrapped in a generic Exception.
+
+
+class AsyncSupabaseDatabaseService(AsyncSupabaseService):
+    """
+    Async service for Supabase Database (PostgreSQL) operations.
+
+    Mirrors SupabaseDatabaseService on the shared httpx client, so
+    independent queries can be overlapped with asyncio.gather and
+    multiplexed over one HTTP/2 connection, e.g.::
+
+        rows, count = await asyncio.gather(
+            db.fetch_data("orders", filters={"user_id": uid}),
+            db.call_function("order_count", {"user_id": uid}),
+        )
+
+    Identical fetch_data calls issued while one is already in flight are
+    coalesced onto the same future, so a thundering herd of equal reads
+    costs a single round trip.
+    """
+
+    __slots__ = ("_inflight",)
+
+    def __init__(self):
+        super().__init__()
+        # key -> asyncio.Future for reads currently in flight
+        self._inflight: Dict[str, "asyncio.Future"] = {}
+
+    async def fetch_data(self,
+                        table: str,
+                        auth_token: Optional[str] = None,
+                        select: str = "*",
+                        filters: Optional[Dict[str, Any]] = None,
+                        order: Optional[str] = None,
+                        limit: Optional[int] = None,
+                        offset: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Fetch data from a table with optional filtering, ordering, and pagination.
+
+        Args:
+            table: Table name
+            auth_token: Optional JWT token for authenticated requests
+            select: Columns to select (default: "*"), including embedded
+                resources such as "*,related_table(*)"
+            filters: Optional filters as dictionary
+            order: Optional order by clause
+            limit: Optional limit of rows to return
+            offset: Optional offset for pagination
+
+        Returns:
+            List of rows as dictionaries
+        """
+        from ._cache import ResponseCache
+        from .database import _filter_params
+
+        endpoint = f"/rest/v1/{table}"
+        params = {"select": select}
+
+        if filters:
+            params.update(_filter_params(filters))
+
+        if order:
+            params["order"] = order
+        if limit is not None:
+            params["limit"] = limit
+        if offset is not None:
+            params["offset"] = offset
+
+        # Single-flight: identical concurrent reads await the leader's
+        # future instead of each paying their own round trip
+        key = ResponseCache.make_key(endpoint, params, auth_token)
+        flight = self._inflight.get(key)
+        if flight is not None:
+            return await asyncio.shield(flight)
+
+        flight = asyncio.get_running_loop().create_future()
+        self._inflight[key] = flight
+        try:
+            result = await self._make_request(
+                method="GET",
+                endpoint=endpoint,
+                auth_token=auth_token,
+                params=params,
+                headers={"Prefer": "return=representation"}
+            )
+        except BaseException as exc:
+            flight.set_exception(exc)
+            # Mark retrieved in case no follower is waiting on the future
+            flight.exception()
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+    async def insert_data(self,
+                         table: str,
+                         data: Union[Dict[str, Any], List[Dict[str, Any]]],
+                         auth_token: Optional[str] = None,
+                         upsert: bool = False,
+                         batch_size: int = 500,
+                         max_concurrency: int = 8) -> List[Dict[str, Any]]:
+        """
+        Insert data into a table.
+
+        Large record lists are split into size-bounded batches posted
+        concurrently under a semaphore, mirroring the sync service: N rows
+        cost ceil(N / batch_size) overlapping round trips instead of one
+        oversized request. Results are returned in input order.
+
+        Args:
+            table: Table name
+            data: Data to insert (single record or list of records)
+            auth_token: Optional JWT token for authenticated requests
+            upsert: Whether to upsert (update on conflict)
+            batch_size: Maximum records per request for list payloads
+            max_concurrency: Maximum batches in flight at once
+
+        Returns:
+            Inserted data
+        """
+        endpoint = f"/rest/v1/{table}"
+        headers = {"Prefer": "return=representation"}
+
+        if upsert:
+            headers["Prefer"] = "resolution=merge-duplicates,return=representation"
+
+        if isinstance(data, list) and len(data) > batch_size:
+            chunks = [data[i:i + batch_size] for i in range(0, len(data), batch_size)]
+            semaphore = asyncio.Semaphore(max_concurrency)
+
+            async def post_chunk(chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+                async with semaphore:
+                    return await self._make_request(
+                        method="POST",
+                        endpoint=endpoint,
+                        auth_token=auth_token,
+                        data=chunk,
+                        headers=headers,
+                    )
+
+            # gather preserves submission order, so output matches input
+            results = await asyncio.gather(*(post_chunk(c) for c in chunks))
+            return [row for rows in results for row in rows]
+
+        return await self._make_request(
+            method="POST",
+            endpoint=endpoint,
+            auth_token=auth_token,
+            data=data,
+            headers=headers
+        )
+
+    async def upsert_data(self,
+                         table: str,
+                         data: Union[Dict[str, Any], List[Dict[str, Any]]],
+                         auth_token: Optional[str] = None,
+                         batch_size: int = 500,
+                         max_concurrency: int = 8) -> List[Dict[str, Any]]:
+        """
+        Upsert data in a table (insert or update).
+
+        Large record lists are batched and posted concurrently, as in
+        insert_data.
+
+        Args:
+            table: Table name
+            data: Data to upsert
+            auth_token: Optional JWT token for authenticated requests
+            batch_size: Maximum records per request for list payloads
+            max_concurrency: Maximum batches in flight at once
+
+        Returns:
+            Upserted data
+        """
+        return await self.insert_data(
+            table,
+            data,
+            auth_token,
+            upsert=True,
+            batch_size=batch_size,
+            max_concurrency=max_concurrency,
+        )
+
+    async def update_data(self,
+                         table: str,
+                         data: Dict[str, Any],
+                         filters: Dict[str, Any],
+                         auth_token: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Update data in a table.
+
+        Args:
+            table: Table name
+            data: Data to update
+            filters: Filters to identify rows to update
+            auth_token: Optional JWT token for authenticated requests
+
+        Returns:
+            Updated data
+        """
+        from .database import _filter_params
+
+        params = {}
+        if filters:
+            params.update(_filter_params(filters))
+
+        return await self._make_request(
+            method="PATCH",
+            endpoint=f"/rest/v1/{table}",
+            auth_token=auth_token,
+            data=data,
+            params=params,
+            headers={"Prefer": "return=representation"}
+        )
+
+    async def delete_data(self,
+                         table: str,
+                         filters: Dict[str, Any],
+                         auth_token: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Delete data from a table.
+
+        Args:
+            table: Table name
+            filters: Filters to identify rows to delete
+            auth_token: Optional JWT token for authenticated requests
+
+        Returns:
+            Deleted data
+        """
+        from .database import _filter_params
+
+        params = {}
+        if filters:
+            params.update(_filter_params(filters))
+
+        return await self._make_request(
+            method="DELETE",
+            endpoint=f"/rest/v1/{table}",
+            auth_token=auth_token,
+            params=params,
+            headers={"Prefer": "return=representation"}
+        )
+
+    async def call_function(self,
+                           function_name: str,
+                           params: Optional[Dict[str, Any]] = None,
+                           auth_token: Optional[str] = None) -> Any:
+        """
+        Call a PostgreSQL function.
+
+        Args:
+            function_name: Function name
+            params: Function parameters
+            auth_token: Optional JWT token for authenticated requests
+
+        Returns:
+            Function result
+        """
+        return await self._make_request(
+            method="POST",
+            endpoint=f"/rest/v1/rpc/{function_name}",
+            auth_token=auth_token,
+            data=params or {}
+        )
+
+
+class AsyncSupabaseAuthService(AsyncSupabaseService):
+    """
+    Async service for Supabase Auth flows.
+
+    Mirrors the commonly chained SupabaseAuthService methods so independent
+    calls (e.g. session fetch plus identity lookup) can run concurrently
+    instead of costing sequential round trips.
+    """
+
+    async def sign_in_with_email(
+        self, email: str, password: str, is_admin: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Sign in a user with email and password.
+
+        Args:
+            email: User's email address
+            password: User's password
+            is_admin: Whether to use the service role key (admin access)
+
+        Returns:
+            Session data including user and tokens
+        """
+        return await self._make_request(
+            method="POST",
+            endpoint="/auth/v1/token?grant_type=password",
+            data={"email": email, "password": password},
+            is_admin=is_admin,
+        )
+
+    async def get_session(self, auth_token: str) -> Dict[str, Any]:
+        """
+        Retrieve the user's session.
+
+        Args:
+            auth_token: User's JWT token
+
+        Returns:
+            Session data
+        """
+        return await self._make_request(
+            method="GET", endpoint="/auth/v1/user", auth_token=auth_token
+        )
+
+    async def refresh_session(self, refresh_token: str) -> Dict[str, Any]:
+        """
+        Refresh the user's session with a refresh token.
+
+        Args:
+            refresh_token: User's refresh token
+
+        Returns:
+            New session data
+        """
+        return await self._make_request(
+            method="POST",
+            endpoint="/auth/v1/token?grant_type=refresh_token",
+            data={"refresh_token": refresh_token},
+        )
+
+    async def sign_out(self, auth_token: str) -> Dict[str, Any]:
+        """
+        Sign out a user.
+
+        Args:
+            auth_token: User's JWT token
+
+        Returns:
+            Success message
+        """
+        return await self._make_request(
+            method="POST", endpoint="/auth/v1/logout", auth_token=auth_token
+        )
+
+    async def get_user(self, user_id: str) -> Dict[str, Any]:
+        """
+        Retrieve a user by ID (admin only).
+
+        Args:
+            user_id: User's ID
+
+        Returns:
+            User data
+        """
+        return await self._make_request(
+            method="GET", endpoint=f"/auth/v1/admin/users/{user_id}", is_admin=True
+        )
+
+    async def get_user_identities(self, user_id: str) -> List[Dict[str, Any]]:
+        """
+        Retrieve identities linked to a user (admin only).
+
+        Args:
+            user_id: User's ID
+
+        Returns:
+            List of identities
+        """
+        user = await self.get_user(user_id)
+        return user.get("identities", [])
+
+
+class AsyncSupabaseStorageService(AsyncSupabaseService):
+    """
+    Async service for Supabase Storage operations.
+
+    Storage traffic is purely I/O-bound and independent per object, so
+    the shared httpx client lets uploads and downloads for many files
+    overlap instead of running serially; upload_many bounds the fan-out
+    with a semaphore to stay under provider connection caps.
+    """
+
+    __slots__ = ()
+
+    async def upload_file(self,
+                         bucket_id: str,
+                         path: str,
+                         file_data: bytes,
+                         content_type: Optional[str] = None,
+                         auth_token: Optional[str] = None,
+                         is_admin: bool = False) -> Dict[str, Any]:
+        """
+        Upload a file to a bucket.
+
+        Args:
+            bucket_id: Bucket identifier
+            path: File path within the bucket
+            file_data: File content as bytes
+            content_type: Optional content type
+            auth_token: Optional JWT token for authenticated requests
+            is_admin: Whether to use service role key (admin access)
+
+        Returns:
+            File data
+        """
+        headers = dict(self._get_headers(auth_token, is_admin))
+        headers["Content-Type"] = content_type or "application/octet-stream"
+
+        response = await self._client.post(
+            f"/storage/v1/object/{bucket_id}/{path}",
+            headers=headers,
+            content=file_data,
+        )
+        if response.status_code >= 400:
+            raise SupabaseAPIError(
+                message=f"Error uploading file: {response.status_code} for {bucket_id}/{path}",
+                status_code=response.status_code,
+                details=self._parse_error_response(response),
+            )
+        return response.json()
+
+    async def download_file(self,
+                           bucket_id: str,
+                           path: str,
+                           auth_token: Optional[str] = None,
+                           is_admin: bool = False) -> bytes:
+        """
+        Download a file from a bucket.
+
+        Args:
+            bucket_id: Bucket identifier
+            path: File path
+            auth_token: Optional JWT token for authenticated requests
+            is_admin: Whether to use admin privileges
+
+        Returns:
+            File content as bytes
+        """
+        response = await self._client.get(
+            f"/storage/v1/object/{bucket_id}/{path}",
+            headers=self._get_headers(auth_token, is_admin),
+        )
+        if response.status_code >= 400:
+            raise SupabaseAPIError(
+                message=f"Error downloading file: {response.status_code} for {bucket_id}/{path}",
+                status_code=response.status_code,
+                details=self._parse_error_response(response),
+            )
+        return response.content
+
+    async def create_signed_urls(self,
+                                bucket_id: str,
+                                paths: List[str],
+                                expires_in: int = 60,
+                                auth_token: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Create signed URLs for multiple files in one round trip.
+
+        Args:
+            bucket_id: Bucket identifier
+            paths: List of file paths
+            expires_in: Expiration time in seconds
+            auth_token: Optional JWT token for authenticated requests
+
+        Returns:
+            List of signed URL data
+        """
+        return await self._make_request(
+            method="POST",
+            endpoint=f"/storage/v1/object/sign/{bucket_id}",
+            auth_token=auth_token,
+            data={"expiresIn": expires_in, "paths": paths},
+        )
+
+    async def delete_file(self,
+                         bucket_id: str,
+                         paths: List[str],
+                         auth_token: Optional[str] = None,
+                         is_admin: bool = False) -> Dict[str, Any]:
+        """
+        Delete files from a bucket.
+
+        Args:
+            bucket_id: Bucket identifier
+            paths: File paths to delete
+            auth_token: Optional JWT token for authenticated requests
+            is_admin: Whether to use admin privileges
+
+        Returns:
+            Success message
+        """
+        return await self._make_request(
+            method="POST",
+            endpoint=f"/storage/v1/bucket/{bucket_id}/remove",
+            auth_token=auth_token,
+            is_admin=is_admin,
+            data={"prefixes": paths},
+        )
+
+    async def upload_many(self,
+                         bucket_id: str,
+                         items: List[Dict[str, Any]],
+                         max_concurrency: int = 16,
+                         auth_token: Optional[str] = None,
+                         is_admin: bool = False) -> List[Any]:
+        """
+        Upload many files concurrently under a bounded fan-out.
+
+        Args:
+            bucket_id: Bucket identifier
+            items: Dictionaries with "path", "file_data", and optionally
+                "content_type" keys
+            max_concurrency: Maximum uploads in flight at once
+            auth_token: Optional JWT token for authenticated requests
+            is_admin: Whether to use service role key (admin access)
+
+        Returns:
+            Per-item results in input order; failed uploads yield the
+            exception instead of aborting the batch
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def upload(item: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.upload_file(
+                    bucket_id,
+                    item["path"],
+                    item["file_data"],
+                    content_type=item.get("content_type"),
+                    auth_token=auth_token,
+                    is_admin=is_admin,
+                )
+
+        return await asyncio.gather(
+            *(upload(item) for item in items), return_exceptions=True
+        )
+
+
+class AsyncSupabaseRealtimeService(AsyncSupabaseService):
+    """
+    Async service for Supabase Realtime broadcasts.
+
+    Broadcasts are independent fire-and-forget POSTs, so high-volume
+    producers can batch them with broadcast_many: N messages go out
+    concurrently over the shared HTTP/2 client and cost roughly one
+    round trip instead of N sequential ones.
+    """
+
+    __slots__ = ()
+
+    async def broadcast_message(self,
+                               channel: str,
+                               payload: Dict[str, Any],
+                               event: str = "broadcast",
+                               auth_token: Optional[str] = None,
+                               is_admin: bool = True) -> Dict[str, Any]:
+        """
+        Broadcast a message to a channel.
+
+        Args:
+            channel: Channel name
+            payload: Message payload
+            event: Event name (default: "broadcast")
+            auth_token: Optional JWT token for authenticated requests
+            is_admin: Whether to use the service role key (admin access)
+
+        Returns:
+            Response data
+        """
+        return await self._make_request(
+            method="POST",
+            endpoint="/realtime/v1/broadcast",
+            auth_token=auth_token,
+            is_admin=is_admin,
+            data={
+                "channel": channel,
+                "event": event,
+                "payload": payload,
+            },
+        )
+
+    async def broadcast_many(self,
+                            messages: List[Dict[str, Any]],
+                            max_concurrency: int = 32,
+                            auth_token: Optional[str] = None,
+                            is_admin: bool = True) -> List[Any]:
+        """
+        Broadcast many messages concurrently under a bounded fan-out.
+
+        Args:
+            messages: Dictionaries with "channel", "payload", and
+                optionally "event" keys
+            max_concurrency: Maximum broadcasts in flight at once
+            auth_token: Optional JWT token for authenticated requests
+            is_admin: Whether to use the service role key (admin access)
+
+        Returns:
+            Per-message results in input order; failed broadcasts yield
+            the exception instead of aborting the batch
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def broadcast(message: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.broadcast_message(
+                    message["channel"],
+                    message["payload"],
+                    event=message.get("event", "broadcast"),
+                    auth_token=auth_token,
+                    is_admin=is_admin,
+                )
+
+        return await asyncio.gather(
+            *(broadcast(message) for message in messages),
+            return_exceptions=True,
+        )
@@ -0,0 +1,383 @@
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Callable, Optional
+
+try:
+    # orjson makes the snapshot round trip markedly cheaper; optional
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # redis enables a shared cache tier across workers; optional dependency
+    import redis
+except ImportError:
+    redis = None
+
+# Namespace prefix for keys in shared backends, versioned so a format
+# change can invalidate old entries by bumping the prefix
+_KEY_PREFIX = "sb:v1:"
+
+
+def _freeze(value: Any) -> bytes:
+    """Serialize a payload to an immutable bytes snapshot for storage."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, default=str).encode()
+
+
+def _thaw(raw: bytes) -> Any:
+    """Rebuild a fresh payload from a stored snapshot."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+class MemoryStore:
+    """
+    In-process TTL + LRU store holding serialized payload snapshots.
+
+    Thread-safe; the least recently used entries are evicted once max_size
+    is reached.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, raw = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return raw
+
+    def set(self, key: str, raw: bytes, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, raw)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate_prefix(self, prefix: str) -> int:
+        with self._lock:
+            stale = [k for k in self._entries if k.startswith(prefix)]
+            for k in stale:
+                del self._entries[k]
+            return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisStore:
+    """
+    Redis-backed store so sibling workers share one cache tier.
+
+    Keys are namespaced under sb:v1: and expiry is delegated to Redis via
+    SET ... EX. Requires the redis package.
+    """
+
+    def __init__(self, url: Optional[str] = None):
+        if redis is None:
+            raise ImportError(
+                "Could not import 'redis'. The shared cache backend requires "
+                "the redis package. Please install it using: pip install redis"
+            )
+        self._client = redis.Redis.from_url(
+            url or os.environ.get("SUPABASE_REDIS_URL", "redis://localhost:6379/0")
+        )
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._client.get(_KEY_PREFIX + key)
+
+    def set(self, key: str, raw: bytes, ttl: float) -> None:
+        # Redis EX wants an integer number of seconds, minimum 1
+        self._client.set(_KEY_PREFIX + key, raw, ex=max(1, int(ttl)))
+
+    def invalidate_prefix(self, prefix: str) -> int:
+        count = 0
+        for key in self._client.scan_iter(match=_KEY_PREFIX + prefix + "*"):
+            self._client.delete(key)
+            count += 1
+        return count
+
+    def clear(self) -> None:
+        self.invalidate_prefix("")
+
+
+class TieredStore:
+    """
+    Two-tier store: in-process memory (L1) in front of Redis (L2).
+
+    Reads try L1 first and populate it on an L2 hit; writes and
+    invalidations fan out to both tiers.
+    """
+
+    def __init__(self, l1: MemoryStore, l2: RedisStore,
+                 l1_ttl_seconds: float = 5.0):
+        self._l1 = l1
+        self._l2 = l2
+        # L1 entries are short-lived so cross-worker invalidations via L2
+        # are not masked for long
+        self.l1_ttl_seconds = l1_ttl_seconds
+
+    def get(self, key: str) -> Optional[bytes]:
+        raw = self._l1.get(key)
+        if raw is not None:
+            return raw
+
+        raw = self._l2.get(key)
+        if raw is not None:
+            self._l1.set(key, raw, self.l1_ttl_seconds)
+        return raw
+
+    def set(self, key: str, raw: bytes, ttl: float) -> None:
+        self._l1.set(key, raw, min(ttl, self.l1_ttl_seconds))
+        self._l2.set(key, raw, ttl)
+
+    def invalidate_prefix(self, prefix: str) -> int:
+        count = self._l1.invalidate_prefix(prefix)
+        return count + self._l2.invalidate_prefix(prefix)
+
+    def clear(self) -> None:
+        self._l1.clear()
+        self._l2.clear()
+
+
+def _store_from_env(max_size: int):
+    """
+    Build the cache store selected by SUPABASE_CACHE_BACKEND.
+
+    Accepts "memory" (default), "redis", or "tiered"; the Redis URL comes
+    from SUPABASE_REDIS_URL.
+    """
+    backend = os.environ.get("SUPABASE_CACHE_BACKEND", "memory").lower()
+    if backend == "redis":
+        return RedisStore()
+    if backend == "tiered":
+        return TieredStore(MemoryStore(max_size=max_size), RedisStore())
+    return MemoryStore(max_size=max_size)
+
+
+class ResponseCache:
+    """
+    TTL cache for Supabase response payloads over a pluggable store.
+
+    Keys are derived from the request shape (endpoint, params, whether a
+    user token was used, admin mode) and values are stored as serialized
+    snapshots, so hits always return a fresh payload the caller can mutate.
+    The backing store defaults to in-process memory; set
+    SUPABASE_CACHE_BACKEND=redis or tiered to share hits across workers.
+    Tracks hit/miss counters for observability.
+    """
+
+    def __init__(self, max_size: int = 1024, default_ttl_seconds: float = 30.0,
+                 store=None):
+        self.max_size = max_size
+        self.default_ttl_seconds = default_ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._store = store if store is not None else _store_from_env(max_size)
+        # Single-flight bookkeeping for stale-while-revalidate refreshes
+        self._inflight: dict = {}
+        self._inflight_lock = Lock()
+        self._refresh_pool: Optional[ThreadPoolExecutor] = None
+
+    @staticmethod
+    def make_key(
+        endpoint: str,
+        params: Optional[dict] = None,
+        auth_token: Optional[str] = None,
+        is_admin: bool = False,
+    ) -> str:
+        """
+        Build a stable cache key for a GET-shaped request.
+
+        The auth token itself is hashed rather than stored so plaintext
+        credentials never sit in cache keys.
+        """
+        token_hash = (
+            hashlib.blake2b(auth_token.encode(), digest_size=8).hexdigest()
+            if auth_token
+            else ""
+        )
+        payload = json.dumps(
+            {
+                "ep": endpoint,
+                "p": sorted((params or {}).items()),
+                "a": token_hash,
+                "ad": is_admin,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        # Prefix with the endpoint so invalidate_prefix can match by table
+        return endpoint + "|" + hashlib.blake2b(
+            payload.encode(), digest_size=16
+        ).hexdigest()
+
+    def _lookup(self, key: str):
+        """Return (value, is_fresh) for a live entry, or None on miss."""
+        raw = self._store.get(key)
+        if raw is None:
+            return None
+        # Entries are stored as serialized bytes, so every hit rebuilds
+        # a fresh payload: callers can't mutate the cached copy, and the
+        # round trip is cheaper than deep-copying nested dicts
+        entry = _thaw(raw)
+        return entry["v"], time.time() < entry["fu"]
+
+    def get(self, key: str) -> Any:
+        """
+        Return a fresh copy of the cached value, or None on miss/expiry.
+
+        Entries in their stale-while-revalidate window count as misses
+        here; use get_or_refresh to serve them while revalidating.
+        """
+        entry = self._lookup(key)
+        if entry is None or not entry[1]:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry[0]
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None,
+            swr: float = 0.0, empty_ttl: Optional[float] = None) -> None:
+        """
+        Store a value with the given TTL (default_ttl_seconds if None).
+
+        With swr > 0 the entry survives for ttl + swr seconds: fresh for
+        ttl, then eligible for stale-while-revalidate serving. When
+        empty_ttl is given, falsy values (negative results such as [])
+        are cached for that shorter window instead, so polling for a
+        not-yet-existing row still sees it appear promptly.
+        """
+        if ttl is None:
+            ttl = self.default_ttl_seconds
+        if empty_ttl is not None and not value:
+            ttl, swr = empty_ttl, 0.0
+        payload = {"fu": time.time() + ttl, "v": value}
+        self._store.set(key, _freeze(payload), ttl + swr)
+
+    def get_or_refresh(self, key: str, loader: Callable[[], Any],
+                       ttl: Optional[float] = None,
+                       swr: float = 0.0,
+                       empty_ttl: Optional[float] = None) -> Any:
+        """
+        Serve from cache, refreshing stale entries in the background.
+
+        Fresh entries are returned directly. Entries inside their swr
+        window are returned immediately while a single background refresh
+        (deduplicated per key) calls the loader and rewrites the entry, so
+        concurrent callers never stampede the origin. On a full miss the
+        loader runs synchronously.
+
+        Args:
+            key: Cache key from make_key
+            loader: Zero-argument callable fetching a fresh value
+            ttl: Seconds the refreshed value stays fresh
+            swr: Seconds a stale value may still be served while refreshing
+            empty_ttl: Optional shorter TTL for falsy (negative) results
+
+        Returns:
+            The cached or freshly loaded value
+        """
+        entry = self._lookup(key)
+        if entry is not None:
+            value, is_fresh = entry
+            self.hits += 1
+            if not is_fresh:
+                self._refresh_in_background(key, loader, ttl, swr, empty_ttl)
+            return value
+
+        self.misses += 1
+        return self._load_single_flight(key, loader, ttl, swr, empty_ttl)
+
+    def _load_single_flight(self, key: str, loader: Callable[[], Any],
+                            ttl: Optional[float], swr: float,
+                            empty_ttl: Optional[float] = None) -> Any:
+        """
+        Run the loader once per key, coalescing concurrent misses.
+
+        The first caller for a key performs the fetch; callers arriving
+        while it is in flight block on the same future and share its
+        result (or exception), so N identical concurrent misses cost one
+        origin request.
+        """
+        with self._inflight_lock:
+            flight = self._inflight.get(key)
+            if flight is None:
+                flight = self._inflight[key] = Future()
+                is_leader = True
+            else:
+                is_leader = False
+
+        if not is_leader:
+            return flight.result()
+
+        try:
+            value = loader()
+        except BaseException as exc:
+            flight.set_exception(exc)
+            raise
+        else:
+            self.set(key, value, ttl=ttl, swr=swr, empty_ttl=empty_ttl)
+            flight.set_result(value)
+            return value
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def _refresh_in_background(self, key: str, loader: Callable[[], Any],
+                               ttl: Optional[float], swr: float,
+                               empty_ttl: Optional[float] = None) -> None:
+        """Submit a deduplicated background refresh for a stale key."""
+        with self._inflight_lock:
+            if key in self._inflight:
+                return
+            if self._refresh_pool is None:
+                self._refresh_pool = ThreadPoolExecutor(
+                    max_workers=4, thread_name_prefix="supabase-cache-swr"
+                )
+
+            def refresh():
+                try:
+                    self.set(key, loader(), ttl=ttl, swr=swr, empty_ttl=empty_ttl)
+                finally:
+                    with self._inflight_lock:
+                        self._inflight.pop(key, None)
+
+            self._inflight[key] = self._refresh_pool.submit(refresh)
+
+    def invalidate_prefix(self, prefix: str) -> int:
+        """
+        Drop every entry whose key starts with the given endpoint prefix.
+
+        Used by write paths to evict reads against the table they touched.
+
+        Returns:
+            Number of entries removed
+        """
+        return self._store.invalidate_prefix(prefix)
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        self._store.clear()
+        self.hits = 0
+        self.misses = 0
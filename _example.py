@@ -1,4 +1,7 @@
-from django.http import JsonResponse
+import hashlib
+import json
+
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 from .client import supabase
@@ -35,16 +38,28 @@ def example_supabase_view(request):
         try:
             # Try to fetch data from the table
             data = db_service.fetch_data(table=table_name, limit=10)
-            return JsonResponse(
+
+            # Compute an ETag from the payload so repeated identical GETs can
+            # be answered with 304 Not Modified and no response body
+            etag = hashlib.blake2b(
+                json.dumps(data, sort_keys=True).encode(), digest_size=16
+            ).hexdigest()
+            if request.headers.get("If-None-Match") == etag:
+                return HttpResponseNotModified()
+
+            response = JsonResponse(
                 {
                     "success": True,
                     "data": data,
                     "message": f"Successfully fetched data from {table_name}",
                 }
             )
+            response["ETag"] = etag
+            response["Cache-Control"] = "public, max-age=30"
+            return response
         except Exception as e:
             # If the table doesn't exist or there's another error, log it
-            logger.warning(f"Error fetching data: {str(e)}")
+            logger.warning("Error fetching data: %s", e)
 
             # Return a fallback response showing the Supabase connection is working
             return JsonResponse(
@@ -58,7 +73,7 @@ def example_supabase_view(request):
 
     except Exception as e:
         # Log any unexpected errors
-        logger.exception(f"Unexpected error in example_supabase_view: {str(e)}")
+        logger.exception("Unexpected error in example_supabase_view: %s", e)
 
         # Return an error response
         return JsonResponse(
@@ -87,20 +102,14 @@ def supabase_health_check(request):
         JsonResponse: JSON response with connection status
     """
     try:
-        # Get the raw Supabase client to check if it's initialized
-        raw_client = supabase.get_raw_client()
-
-        # If we get here, the client was initialized successfully
-        return JsonResponse(
-            {
-                "status": "ok",
-                "message": "Supabase client is configured correctly",
-                "supabase_url": raw_client.supabase_url,  # Safe to show the URL
-            }
+        # The payload (including the Supabase URL, which is safe to show) is
+        # serialized once and cached, so repeated probes do near-zero work
+        return HttpResponse(
+            supabase.health_payload, content_type="application/json"
         )
     except Exception as e:
         # Log the error
-        logger.exception(f"Supabase health check failed: {str(e)}")
+        logger.exception("Supabase health check failed: %s", e)
 
         # Return an error response
         return JsonResponse(
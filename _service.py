@@ -1,35 +1,49 @@
-import json
-from typing import Any, Dict, Optional
+import os
+from typing import Any, Dict, Optional, Tuple, Union
 
 import requests
-from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
 
-logger = logging.getLogger(" apps.supabase_home")
-
-
-class SupabaseError(Exception):
-    """Base exception for Supabase-related errors"""
-
-    pass
-
+from ._service_base import (
+    SupabaseError,
+    SupabaseAuthError,
+    SupabaseAPIError,
+    SupabaseServiceBase,
+    orjson,
+)
+
+__all__ = [
+    "SupabaseService",
+    "SupabaseError",
+    "SupabaseAuthError",
+    "SupabaseAPIError",
+]
 
-class SupabaseAuthError(SupabaseError):
-    """Exception raised for authentication errors"""
-
-    pass
+logger = logging.getLogger(" apps.supabase_home")
 
+# Split (connect, read) timeout: fail fast when Supabase is unreachable
+# while still tolerating slow reads on large responses
+DEFAULT_TIMEOUT = (3.05, 27)
 
-class SupabaseAPIError(SupabaseError):
-    """Exception raised for API errors"""
+# Connection-pool size, shared with the async client. Tunable via env so
+# ops can match it to the worker/thread count without a code change:
+# undersized pools stall concurrent batch work behind "pool is full"
+# socket waits, oversized ones risk tripping provider-side caps.
+POOL_MAXSIZE = int(os.environ.get("SUPABASE_MAX_POOL_CONNECTIONS", "100"))
 
-    def __init__(self, message: str, status_code: int = None, details: Dict = None):
-        self.status_code = status_code
-        self.details = details or {}
-        super().__init__(message)
+# orjson options for request bodies: tolerate non-string dict keys (stdlib
+# json coerces these silently) and serialize numpy scalars/arrays directly
+# when callers insert rows straight from numeric pipelines
+_ORJSON_OPTS = (
+    orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    if orjson is not None
+    else 0
+)
 
 
-class SupabaseService:
+class SupabaseService(SupabaseServiceBase):
     """
     Service class for interacting with Supabase API.
 
@@ -41,60 +55,70 @@ class SupabaseService:
     - Realtime
 
     It handles authentication, request formatting, and response parsing.
+    Settings validation and header construction live in SupabaseServiceBase,
+    shared with the async variant; this class adds the sync requests backend.
     """
 
+    __slots__ = ("_session",)
+
     def __init__(self):
-        # Get configuration from settings
-        self.base_url = settings.SUPABASE_URL
-        self.anon_key = settings.SUPABASE_ANON_KEY
-        self.service_role_key = settings.SUPABASE_SERVICE_ROLE_KEY
-
-        # Validate required settings
-        if not self.base_url:
-            logger.error("SUPABASE_URL is not set in settings")
-            raise ValueError("SUPABASE_URL is not set in settings")
-
-        if not self.anon_key:
-            logger.error("SUPABASE_ANON_KEY is not set in settings")
-            raise ValueError("SUPABASE_ANON_KEY is not set in settings")
-
-        if not self.service_role_key:
-            logger.warning(
-                "SUPABASE_SERVICE_ROLE_KEY is not set in settings. Admin operations will not work."
-            )
+        super().__init__()
+
+        # Reuse a pooled session so TCP/TLS connections to Supabase are kept
+        # alive across requests instead of paying a handshake on every call.
+        # pool_maxsize is sized for bursty workloads (e.g. concurrent batch
+        # inserts or list_users pagination) so threads don't queue on sockets.
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=20,
+            pool_maxsize=POOL_MAXSIZE,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.2,
+                status_forcelist=(429, 502, 503, 504),
+                allowed_methods=frozenset(
+                    ["GET", "POST", "PATCH", "PUT", "DELETE"]
+                ),
+            ),
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def close(self) -> None:
+        """
+        Close the pooled HTTP session.
 
-    def _get_headers(
-        self, auth_token: Optional[str] = None, is_admin: bool = False
-    ) -> Dict[str, str]:
+        Call this on process teardown to release kept-alive connections.
         """
-        Get the headers for a Supabase API request.
+        self._session.close()
 
-        Args:
-            auth_token: Optional JWT token for authenticated requests
-            is_admin: Whether to use the service role key (admin access)
+    def _raise_for_error_response(self, response, url: str) -> None:
+        """
+        Raise the service-contract error for a raw-session response.
 
-        Returns:
-            Dict of headers
+        The streaming/typed read paths bypass _make_request, so they use
+        this to keep its classification: 401/403 surface as
+        SupabaseAuthError, any other >= 400 status as SupabaseAPIError.
+
+        Args:
+            response: requests.Response to inspect
+            url: Request URL, used in the error message
         """
-        headers = {
-            "Content-Type": "application/json",
-            "apikey": self.service_role_key if is_admin else self.anon_key,
-        }
-
-        # For storage operations, we need to set the Authorization header correctly
-        # If is_admin is True, we should use the service role key regardless of auth_token
-        if is_admin:
-            # Use service role key as bearer token for admin operations
-            if not self.service_role_key:
-                raise SupabaseAuthError(
-                    "Service role key is required for admin operations"
-                )
-            headers["Authorization"] = f"Bearer {self.service_role_key}"
-        elif auth_token:
-            # Use the provided auth token if not in admin mode
-            headers["Authorization"] = f"Bearer {auth_token}"
+        status_code = response.status_code
+        if status_code < 400:
+            return
+
+        error_detail = self._parse_error_response(response)
+
+        if status_code == 401 or status_code == 403:
+            logger.error("Authentication error: %s", error_detail)
+            raise SupabaseAuthError(f"Authentication error: {error_detail}")
 
-        return headers
+        raise SupabaseAPIError(
+            message=f"Supabase API error: {status_code} {response.reason} for url: {url}",
+            status_code=status_code,
+            details=error_detail,
+        )
 
     def _make_request(
         self,
@@ -105,7 +129,7 @@ class SupabaseService:
         data: Optional[Dict[str, Any]] = None,
         params: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, str]] = None,
-        timeout: int = 30,
+        timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
     ) -> Dict[str, Any]:
         """
         Make a request to the Supabase API.
@@ -118,7 +142,8 @@ class SupabaseService:
             data: Optional request body data
             params: Optional query parameters
             headers: Optional additional headers
-            timeout: Request timeout in seconds
+            timeout: Request timeout in seconds, either a single number or
+                a (connect, read) tuple
 
         Returns:
             Response data as dictionary
@@ -132,110 +157,96 @@ class SupabaseService:
         url = f"{self.base_url}{endpoint}"
 
         # Get default headers and merge with any additional headers
+        # (the defaults are a shared read-only mapping, so merge into a copy)
         request_headers = self._get_headers(auth_token, is_admin)
         if headers:
-            request_headers.update(headers)
-
-        # Enhanced logging for debugging
-        logger.info(f"Making {method} request to {url}")
-        logger.info(f"Headers: {request_headers}")
-        if 'Authorization' in request_headers:
-            auth_header = request_headers['Authorization']
-            logger.info(f"Authorization header: {auth_header[:15]}...")
-        else:
-            logger.info("No Authorization header found")
-        
-        logger.info(f"Request data: {data}")
-        logger.info(f"Request params: {params}")
-
-        # Ensure data is not None for any requests with application/json content type
-        # Supabase API expects a valid JSON body (even if empty) when Content-Type is application/json
-        if data is None and 'Content-Type' in request_headers and request_headers['Content-Type'] == 'application/json':
+            request_headers = {**request_headers, **headers}
+
+        # Verbose request logging is debug-only and lazily formatted so the
+        # hot path pays nothing when the handler is disabled
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Making %s request to %s", method, url)
+            logger.debug("Headers: %s", request_headers)
+            logger.debug("Request data: %s", data)
+            logger.debug("Request params: %s", params)
+
+        # Supabase expects a valid JSON body (even if empty); _get_headers
+        # always sets an application/json Content-Type, so there is no need
+        # to re-check the header on every call
+        if data is None:
             data = {}
-            logger.info("Initialized empty JSON data")
+
+        # Pre-encode the body with orjson when available instead of letting
+        # requests run the slower stdlib encoder via json=
+        if orjson is not None:
+            body_kwargs = {"data": orjson.dumps(data, option=_ORJSON_OPTS)}
+        else:
+            body_kwargs = {"json": data}
 
         try:
-            logger.debug(f"Making {method} request to {url}")
-            response = requests.request(
+            response = self._session.request(
                 method=method,
                 url=url,
                 headers=request_headers,
-                json=data,
                 params=params,
                 timeout=timeout,
+                **body_kwargs,
             )
 
-            # Log request details at debug level
-            logger.info(f"Request to {url}: {method} - Status: {response.status_code}")
-            logger.info(f"Response headers: {response.headers}")
-            
-            # Log response content for debugging
-            try:
-                if response.content:
-                    logger.info(f"Response content: {response.content[:200]}...")
-                    if response.status_code >= 400:
-                        logger.error(f"Error response: {response.content}")
-            except Exception as e:
-                logger.error(f"Error logging response content: {str(e)}")
-
-            # Handle different error scenarios
-            if response.status_code == 401 or response.status_code == 403:
-                error_detail = self._parse_error_response(response)
-                logger.error(f"Authentication error: {error_detail}")
-                raise SupabaseAuthError(f"Authentication error: {error_detail}")
+            status_code = response.status_code
 
-            # Raise exception for other error status codes
-            response.raise_for_status()
+            # Log response details at debug level
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Request to %s: %s - Status: %s", url, method, status_code
+                )
+                logger.debug("Response headers: %s", response.headers)
+                if response.content:
+                    logger.debug("Response content: %.200s...", response.content)
 
-            # Return JSON response if available, otherwise return empty dict
-            if response.content:
-                return response.json()
-            return {}
+            # Single status branch: the common success path returns without
+            # the cost of raise_for_status building and raising an HTTPError
+            if status_code < 400:
+                # Return JSON response if available, otherwise return empty dict
+                if response.content:
+                    if orjson is not None:
+                        return orjson.loads(response.content)
+                    return response.json()
+                return {}
 
-        except requests.exceptions.HTTPError as e:
+            logger.error("Error response: %s", response.content)
             error_detail = self._parse_error_response(response)
-            logger.error(f"Supabase API error: {str(e)} - Details: {error_detail}")
+
+            if status_code == 401 or status_code == 403:
+                logger.error("Authentication error: %s", error_detail)
+                raise SupabaseAuthError(f"Authentication error: {error_detail}")
+
+            logger.error(
+                "Supabase API error: %s for %s - Details: %s",
+                status_code, url, error_detail,
+            )
             raise SupabaseAPIError(
-                message=f"Supabase API error: {str(e)}",
-                status_code=response.status_code,
+                message=f"Supabase API error: {status_code} {response.reason} for url: {url}",
+                status_code=status_code,
                 details=error_detail,
             )
 
         except requests.exceptions.ConnectionError as e:
-            logger.error("Supabase connection error: " + str(e))
+            logger.error("Supabase connection error: %s", e)
             raise SupabaseError(
                 "Connection error: Unable to connect to Supabase API. Check your network connection and Supabase URL."
             )
 
         except requests.exceptions.Timeout as e:
-            logger.error(f"Supabase request timeout: {str(e)}")
+            logger.error("Supabase request timeout: %s", e)
             raise SupabaseError(
-                f"Request timeout: The request to Supabase API timed out after {timeout} seconds."
+                f"Request timeout: The request to Supabase API timed out (timeout={timeout} seconds)."
             )
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"Supabase request exception: {str(e)}")
+            logger.error("Supabase request exception: %s", e)
             raise SupabaseError(f"Request error: {str(e)}")
 
-        except SupabaseAuthError as e:
-            # Re-raise SupabaseAuthError without wrapping it in a generic Exception
-            logger.error(f"Authentication error being re-raised: {str(e)}")
-            raise
-
-        except Exception as e:
-            logger.exception(f"Unexpected error during Supabase request: {str(e)}")
-            raise Exception(f"Unexpected error during Supabase request: {str(e)}")
-
-    def _parse_error_response(self, response: requests.Response) -> Dict:
-        """Parse error response from Supabase API
-
-        Args:
-            response: Response object from requests
-
-        Returns:
-            Dictionary containing error details
-        """
-        try:
-            return response.json()
-        except json.JSONDecodeError:
-            return {"status": response.status_code, "message": response.text}
+        # SupabaseAuthError/SupabaseAPIError raised above propagate as-is;
+        # anything truly unexpected keeps its type and traceback instead of
+        # being re-wrapped in a generic Exception.
@@ -0,0 +1,198 @@
+import json
+import queue
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
+
+from django.conf import settings
+import logging
+
+try:
+    # orjson is a C-accelerated encoder/decoder that is several times faster
+    # than the stdlib json used by requests; fall back silently when absent
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(" apps.supabase_home")
+
+# Single reusable decoder for the stdlib fallback path; response.json()
+# would otherwise construct a fresh decoder on every error response
+_json_decode = json.JSONDecoder().decode
+
+_log_listener = None
+
+
+def enable_async_logging() -> QueueListener:
+    """
+    Route this package's log records through a background thread.
+
+    Replaces the service logger's handlers with a QueueHandler and starts a
+    QueueListener that forwards records to the original handlers on a
+    daemon thread, so request threads never block on log I/O. Call once
+    during application setup; idempotent. The returned listener's stop()
+    flushes remaining records on shutdown.
+
+    Returns:
+        The started QueueListener
+    """
+    global _log_listener
+
+    if _log_listener is not None:
+        return _log_listener
+
+    # Forward to the logger's own handlers, or the root handlers when the
+    # service logger just propagates
+    handlers = logger.handlers[:] or logging.getLogger().handlers[:]
+
+    log_queue = queue.SimpleQueue()
+    _log_listener = QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    logger.handlers = [QueueHandler(log_queue)]
+    logger.propagate = False
+    _log_listener.start()
+    return _log_listener
+
+
+class SupabaseError(Exception):
+    """Base exception for Supabase-related errors"""
+
+    __slots__ = ()
+
+
+class SupabaseAuthError(SupabaseError):
+    """Exception raised for authentication errors"""
+
+    __slots__ = ()
+
+
+class SupabaseAPIError(SupabaseError):
+    """Exception raised for API errors"""
+
+    __slots__ = ("status_code", "details")
+
+    def __init__(self, message: str, status_code: int = None, details: Dict = None):
+        self.status_code = status_code
+        self.details = details or {}
+        super().__init__(message)
+
+
+@lru_cache(maxsize=256)
+def _bearer_headers(anon_key: str, auth_token: str) -> Mapping[str, str]:
+    """Build (and memoize) the header mapping for a user-token request.
+
+    Module-level so lru_cache keys on the raw strings rather than on
+    service instances; repeat requests with the same token reuse one
+    read-only mapping instead of allocating a dict each call.
+    """
+    return MappingProxyType({
+        "Content-Type": "application/json",
+        "apikey": anon_key,
+        "Authorization": f"Bearer {auth_token}",
+    })
+
+
+class SupabaseServiceBase:
+    """
+    Transport-agnostic base for the Supabase services.
+
+    Holds everything that is identical between the sync (requests) and
+    async (httpx) services: settings loading and validation, header
+    construction, and error-response parsing. Subclasses provide the HTTP
+    backend and their own `_make_request`.
+    """
+
+    __slots__ = (
+        "base_url",
+        "anon_key",
+        "service_role_key",
+        "_anon_headers",
+        "_admin_headers",
+    )
+
+    def __init__(self):
+        # Get configuration from settings
+        self.base_url = settings.SUPABASE_URL
+        self.anon_key = settings.SUPABASE_ANON_KEY
+        self.service_role_key = settings.SUPABASE_SERVICE_ROLE_KEY
+
+        # Validate required settings
+        if not self.base_url:
+            logger.error("SUPABASE_URL is not set in settings")
+            raise ValueError("SUPABASE_URL is not set in settings")
+
+        if not self.anon_key:
+            logger.error("SUPABASE_ANON_KEY is not set in settings")
+            raise ValueError("SUPABASE_ANON_KEY is not set in settings")
+
+        if not self.service_role_key:
+            logger.warning(
+                "SUPABASE_SERVICE_ROLE_KEY is not set in settings. Admin operations will not work."
+            )
+
+        # Normalize once so per-request URL building is a plain concat
+        self.base_url = self.base_url.rstrip("/")
+
+        # Header templates are stateless per instance; precompute them once so
+        # the hot path hands out a shared read-only mapping instead of
+        # rebuilding the same dict on every request
+        self._anon_headers = MappingProxyType({
+            "Content-Type": "application/json",
+            "apikey": self.anon_key,
+        })
+        self._admin_headers = MappingProxyType({
+            "Content-Type": "application/json",
+            "apikey": self.service_role_key,
+            "Authorization": f"Bearer {self.service_role_key}",
+        })
+
+    def _get_headers(
+        self, auth_token: Optional[str] = None, is_admin: bool = False
+    ) -> Dict[str, str]:
+        """
+        Get the headers for a Supabase API request.
+
+        Args:
+            auth_token: Optional JWT token for authenticated requests
+            is_admin: Whether to use the service role key (admin access)
+
+        Returns:
+            Read-only mapping of headers. Callers that need to add or change
+            entries should merge into a fresh dict rather than mutate.
+        """
+        # For storage operations, we need to set the Authorization header correctly
+        # If is_admin is True, we should use the service role key regardless of auth_token
+        if is_admin:
+            # Use service role key as bearer token for admin operations
+            if not self.service_role_key:
+                raise SupabaseAuthError(
+                    "Service role key is required for admin operations"
+                )
+            return self._admin_headers
+
+        if auth_token:
+            # Use the provided auth token if not in admin mode
+            return _bearer_headers(self.anon_key, auth_token)
+
+        return self._anon_headers
+
+    def _parse_error_response(self, response) -> Dict:
+        """Parse error response from Supabase API
+
+        Works with both requests and httpx response objects, which share
+        the status_code/content/text/json interface.
+
+        Args:
+            response: Response object from the HTTP backend
+
+        Returns:
+            Dictionary containing error details
+        """
+        try:
+            if orjson is not None:
+                return orjson.loads(response.content)
+            return _json_decode(response.text)
+        except ValueError:
+            return {"status": response.status_code, "message": response.text}
@@ -1,6 +1,18 @@
-from typing import Any, Dict, List, Optional
+# Defer annotation evaluation: this module has dozens of annotated methods,
+# and postponing them skips building the generic-alias objects at import time
+from __future__ import annotations
 
-from ._service import SupabaseService
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
+
+from ._service import DEFAULT_TIMEOUT, SupabaseService, SupabaseAPIError
+
+try:
+    # ijson enables incremental decoding of large JSON arrays so streamed
+    # responses never have to be buffered in full; optional dependency
+    import ijson
+except ImportError:
+    ijson = None
 
 
 class SupabaseAuthService(SupabaseService):
@@ -11,6 +23,8 @@ class SupabaseAuthService(SupabaseService):
     and session handling using Supabase Auth.
     """
 
+    __slots__ = ()
+
     def create_user(
         self, email: str, password: str, user_metadata: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
@@ -62,11 +76,41 @@ class SupabaseAuthService(SupabaseService):
         """
         return self._make_request(
             method="POST",
-            endpoint="/auth/v1/token?grant_type=password",
+            endpoint="/auth/v1/token",
+            params={"grant_type": "password"},
             data={"email": email, "password": password},
             is_admin=is_admin,
         )
 
+    def sign_in_and_hydrate(self, email: str, password: str) -> Dict[str, Any]:
+        """
+        Sign in and fetch the session and identities in one call.
+
+        Callers commonly chain sign_in_with_email, get_session, and
+        get_user_identities as three serial round trips. After the sign-in
+        response arrives, the session and identities lookups are independent,
+        so they are overlapped on the pooled session instead of paying two
+        more sequential RTTs.
+
+        Args:
+            email: User's email address
+            password: User's password
+
+        Returns:
+            Dictionary with "session", "user", and "identities" keys
+        """
+        session = self.sign_in_with_email(email, password)
+        access_token = session.get("access_token")
+        user_id = session.get("user", {}).get("id")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            user_future = executor.submit(self.get_session, access_token)
+            identities_future = executor.submit(self.get_user_identities, user_id)
+            user = user_future.result()
+            identities = identities_future.result()
+
+        return {"session": session, "user": user, "identities": identities}
+
     def sign_in_with_id_token(self, provider: str, id_token: str) -> Dict[str, Any]:
         """
         Sign in a user with an ID token from a third-party provider.
@@ -80,7 +124,8 @@ class SupabaseAuthService(SupabaseService):
         """
         return self._make_request(
             method="POST",
-            endpoint="/auth/v1/token?grant_type=id_token",
+            endpoint="/auth/v1/token",
+            params={"grant_type": "id_token"},
             data={"provider": provider, "id_token": id_token},
         )
 
@@ -129,7 +174,8 @@ class SupabaseAuthService(SupabaseService):
         """
         return self._make_request(
             method="POST",
-            endpoint=f"/auth/v1/authorize?provider={provider}",
+            endpoint="/auth/v1/authorize",
+            params={"provider": provider},
             data={"redirect_to": redirect_url},
         )
 
@@ -210,7 +256,8 @@ class SupabaseAuthService(SupabaseService):
         """
         return self._make_request(
             method="POST",
-            endpoint="/auth/v1/token?grant_type=refresh_token",
+            endpoint="/auth/v1/token",
+            params={"grant_type": "refresh_token"},
             data={"refresh_token": refresh_token},
         )
 
@@ -228,6 +275,45 @@ class SupabaseAuthService(SupabaseService):
             method="GET", endpoint=f"/auth/v1/admin/users/{user_id}", is_admin=True
         )
 
+    def get_users(self, user_ids: List[str],
+                  max_concurrency: int = 8) -> Dict[str, Dict[str, Any]]:
+        """
+        Retrieve many users by ID concurrently (admin only).
+
+        GoTrue's admin endpoint has no multi-ID filter (PostgREST-style
+        in.(...) params are silently ignored there), so each ID still
+        costs one request; this deduplicates the IDs and overlaps the
+        per-user lookups on the pooled session instead of resolving them
+        sequentially through get_user.
+
+        Args:
+            user_ids: User IDs to resolve (duplicates are collapsed)
+            max_concurrency: Maximum lookups in flight at once
+
+        Returns:
+            Mapping of user ID to user data; unknown IDs are absent
+        """
+        unique_ids = list(dict.fromkeys(user_ids))
+
+        def fetch(user_id: str) -> Optional[Dict[str, Any]]:
+            try:
+                return self.get_user(user_id)
+            except SupabaseAPIError as e:
+                # Unknown IDs are simply absent from the result
+                if e.status_code == 404:
+                    return None
+                raise
+
+        users: Dict[str, Dict[str, Any]] = {}
+        if not unique_ids:
+            return users
+        workers = min(max_concurrency, len(unique_ids))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for user_id, user in zip(unique_ids, executor.map(fetch, unique_ids)):
+                if user is not None:
+                    users[user_id] = user
+        return users
+
     def update_user(self, user_id: str, user_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Update a user's data (admin only).
@@ -250,14 +336,16 @@ class SupabaseAuthService(SupabaseService):
         """
         Retrieve identities linked to a user (admin only).
 
+        GoTrue has no field-selection param on the admin user endpoint,
+        so this fetches the full user record and extracts its identities.
+
         Args:
             user_id: User's ID
 
         Returns:
             List of identities
         """
-        user = self.get_user(user_id)
-        return user.get("identities", [])
+        return self.get_user(user_id).get("identities", [])
 
     def link_identity(
         self, auth_token: str, provider: str, redirect_url: str
@@ -275,7 +363,8 @@ class SupabaseAuthService(SupabaseService):
         """
         return self._make_request(
             method="POST",
-            endpoint=f"/auth/v1/user/identities/authorize?provider={provider}",
+            endpoint="/auth/v1/user/identities/authorize",
+            params={"provider": provider},
             auth_token=auth_token,
             data={"redirect_to": redirect_url},
         )
@@ -423,10 +512,57 @@ class SupabaseAuthService(SupabaseService):
         """
         return self._make_request(
             method="GET",
-            endpoint=f"/auth/v1/admin/users?page={page}&per_page={per_page}",
+            endpoint="/auth/v1/admin/users",
+            params={"page": page, "per_page": per_page},
             is_admin=True,
         )
 
+    def iter_users(self, per_page: int = 200) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over all users (admin only), yielding one user at a time.
+
+        Pages through the admin users endpoint lazily, so enumerating a
+        large user base holds at most one page in memory instead of
+        accumulating every parsed record; with ijson installed users are
+        decoded incrementally while the page is still downloading.
+
+        Args:
+            per_page: Number of users fetched per request
+
+        Yields:
+            User records as dictionaries
+        """
+        url = f"{self.base_url}/auth/v1/admin/users"
+        headers = self._get_headers(is_admin=True)
+        page = 1
+
+        while True:
+            count = 0
+            with self._session.get(
+                url,
+                headers=headers,
+                params={"page": page, "per_page": per_page},
+                stream=True,
+                timeout=DEFAULT_TIMEOUT,
+            ) as response:
+                self._raise_for_error_response(response, url)
+
+                if ijson is not None:
+                    # .raw carries the wire bytes; have urllib3 inflate
+                    # gzip/deflate before ijson parses the stream
+                    response.raw.decode_content = True
+                    for user in ijson.items(response.raw, "users.item"):
+                        count += 1
+                        yield user
+                else:
+                    for user in response.json().get("users", []):
+                        count += 1
+                        yield user
+
+            if count < per_page:
+                break
+            page += 1
+
     def admin_create_user(
         self,
         email: str,
@@ -1,85 +1,121 @@
-from .auth import SupabaseAuthService
-from .database import SupabaseDatabaseService
-from .storage import SupabaseStorageService
-from .edge_functions import SupabaseEdgeFunctionsService
-from .realtime import SupabaseRealtimeService
-from .init import get_supabase_client
+import json
+from functools import cached_property
 
 class SupabaseClient:
     """
     Client for interacting with all Supabase services.
-    
+
     This class provides a unified interface to access all Supabase services:
     - Auth
     - Database
     - Storage
     - Edge Functions
     - Realtime
+
+    Each service is constructed lazily on first access and then cached, so
+    importing this module (and creating the singleton below) stays cheap for
+    workers that only ever touch one service.
     """
-    
-    def __init__(self):
-        # Initialize the raw supabase client
-        self._raw_client = get_supabase_client()
-        
-        # Initialize service classes
-        self.auth = SupabaseAuthService()
-        self.database = SupabaseDatabaseService()
-        self.storage = SupabaseStorageService()
-        self.edge_functions = SupabaseEdgeFunctionsService()
-        self.realtime = SupabaseRealtimeService()
-        
-    def get_auth_service(self) -> SupabaseAuthService:
+
+    @cached_property
+    def _raw_client(self):
+        # Deferred import so module import does not pay client initialization
+        from .init import get_supabase_client
+        return get_supabase_client()
+
+    @cached_property
+    def auth(self) -> "SupabaseAuthService":
+        from .auth import SupabaseAuthService
+        return SupabaseAuthService()
+
+    @cached_property
+    def database(self) -> "SupabaseDatabaseService":
+        from .database import SupabaseDatabaseService
+        return SupabaseDatabaseService()
+
+    @cached_property
+    def storage(self) -> "SupabaseStorageService":
+        from .storage import SupabaseStorageService
+        return SupabaseStorageService()
+
+    @cached_property
+    def edge_functions(self) -> "SupabaseEdgeFunctionsService":
+        from .edge_functions import SupabaseEdgeFunctionsService
+        return SupabaseEdgeFunctionsService()
+
+    @cached_property
+    def realtime(self) -> "SupabaseRealtimeService":
+        from .realtime import SupabaseRealtimeService
+        return SupabaseRealtimeService()
+
+    def get_auth_service(self) -> "SupabaseAuthService":
         """
         Get the Auth service.
-        
+
         Returns:
             SupabaseAuthService instance
         """
         return self.auth
-    
-    def get_database_service(self) -> SupabaseDatabaseService:
+
+    def get_database_service(self) -> "SupabaseDatabaseService":
         """
         Get the Database service.
-        
+
         Returns:
             SupabaseDatabaseService instance
         """
         return self.database
-    
-    def get_storage_service(self) -> SupabaseStorageService:
+
+    def get_storage_service(self) -> "SupabaseStorageService":
         """
         Get the Storage service.
-        
+
         Returns:
             SupabaseStorageService instance
         """
         return self.storage
-    
-    def get_edge_functions_service(self) -> SupabaseEdgeFunctionsService:
+
+    def get_edge_functions_service(self) -> "SupabaseEdgeFunctionsService":
         """
         Get the Edge Functions service.
-        
+
         Returns:
             SupabaseEdgeFunctionsService instance
         """
         return self.edge_functions
-    
-    def get_realtime_service(self) -> SupabaseRealtimeService:
+
+    def get_realtime_service(self) -> "SupabaseRealtimeService":
         """
         Get the Realtime service.
-        
+
         Returns:
             SupabaseRealtimeService instance
         """
         return self.realtime
-    
+
+    @cached_property
+    def health_payload(self) -> bytes:
+        """
+        Prebuilt JSON body for the health check endpoint.
+
+        Computed once on first access so liveness probes don't re-read
+        client attributes or re-serialize the same payload per hit.
+        """
+        return json.dumps(
+            {
+                "status": "ok",
+                "message": "Supabase client is configured correctly",
+                "supabase_url": self._raw_client.supabase_url,
+            }
+        ).encode()
+
     def get_raw_client(self):
         """
         Get the raw Supabase client from supabase-py.
-        
+
         This provides direct access to the underlying client if needed for
         advanced operations not covered by the service classes.
-        
+
         Returns:
             supabase.Client instance
         """
@@ -1,6 +1,164 @@
-from typing import Any, Dict, List, Optional, Union
+import itertools
+import re
+import string
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache, partial
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from ._cache import ResponseCache
+from ._service import DEFAULT_TIMEOUT, SupabaseService, SupabaseAPIError
+
+try:
+    # ijson enables incremental decoding of large JSON arrays so streamed
+    # responses never have to be buffered in full; optional dependency
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    # msgspec decodes JSON straight into typed Struct instances, skipping
+    # the intermediate dict-of-everything representation; optional dependency
+    import msgspec
+except ImportError:
+    msgspec = None
+
+# PostgREST comparison operators accepted in ("op", value) filter tuples
+_FILTER_OPERATORS = frozenset({
+    "eq", "neq", "gt", "gte", "lt", "lte",
+    "like", "ilike", "is", "in",
+    "cs", "cd", "ov", "fts", "plfts", "phfts", "wfts",
+})
+
+
+# Default cache TTLs (seconds) by endpoint prefix, ordered from least to
+# most volatile; the longest matching prefix decides. Used whenever a
+# cached path is engaged without an explicit cache_ttl.
+DEFAULT_TTLS = {
+    "/auth/v1/admin/users": 60,
+    "/rest/v1/rpc/": 15,
+    "/rest/v1/": 30,
+    "/auth/v1/user": 5,
+}
+
+
+def _ttl_for(endpoint: str) -> float:
+    """Return the policy TTL for an endpoint (0 when nothing matches)."""
+    # Most-specific prefix wins: /rest/v1/rpc/fn must resolve to the rpc
+    # TTL, not whichever matching prefix happens to carry the larger value
+    matches = [prefix for prefix in DEFAULT_TTLS if endpoint.startswith(prefix)]
+    if not matches:
+        return 0
+    return DEFAULT_TTLS[max(matches, key=len)]
+
+
+# Valid PostgreSQL identifier (unquoted, up to the 63-byte limit); table
+# names interpolated into exec_sql statements must match this
+_IDENTIFIER_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]{0,62}")
+
+# Test-table DDL precompiled once at import; each create_test_table call is
+# a single substitute() instead of rebuilding the multi-statement f-string
+_CREATE_TEST_SQL = string.Template("""
+        CREATE TABLE IF NOT EXISTS $table (
+            id SERIAL PRIMARY KEY,
+            name TEXT NOT NULL,
+            description TEXT,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+            user_id TEXT
+        );
+
+        -- Set up RLS policies
+        ALTER TABLE $table ENABLE ROW LEVEL SECURITY;
+
+        -- Create policy to allow all operations for authenticated users
+        DROP POLICY IF EXISTS "Allow all operations for authenticated users" ON $table;
+        CREATE POLICY "Allow all operations for authenticated users"
+        ON $table
+        FOR ALL
+        TO authenticated
+        USING (true)
+        WITH CHECK (true);
+        """)
+
+
+def _validate_identifier(table: str) -> str:
+    """
+    Ensure a table name is a plain SQL identifier before interpolation.
+
+    Args:
+        table: Candidate table name
+
+    Returns:
+        The validated table name
+
+    Raises:
+        ValueError: If the name is not a valid unquoted identifier
+    """
+    if not _IDENTIFIER_RE.fullmatch(table):
+        raise ValueError(f"Invalid SQL identifier: {table!r}")
+    return table
+
+
+@lru_cache(maxsize=256)
+def _render_create_sql(table: str) -> str:
+    """Validate a table name and render its test-table DDL, memoized."""
+    return _CREATE_TEST_SQL.substitute(table=_validate_identifier(table))
+
+
+def _format_filter(value: Any) -> str:
+    """
+    Translate a Python value into a PostgREST filter expression.
+
+    None maps to "is.null", list/set/tuple values collapse to a single
+    "in.(...)" filter (one request instead of N), an ("op", operand) tuple
+    selects the operator explicitly (e.g. ("gte", 10) -> "gte.10"), and
+    anything else falls back to equality.
+    """
+    if value is None:
+        return "is.null"
+
+    if (
+        isinstance(value, tuple)
+        and len(value) == 2
+        and isinstance(value[0], str)
+        and value[0] in _FILTER_OPERATORS
+    ):
+        operator, operand = value
+        if isinstance(operand, (list, tuple, set)):
+            return f"{operator}.({','.join(str(v) for v in operand)})"
+        return f"{operator}.{operand}"
+
+    if isinstance(value, (list, tuple, set)):
+        return f"in.({','.join(str(v) for v in value)})"
+
+    return f"eq.{value}"
+
+
+def _filter_params(filters: Dict[str, Any]) -> Dict[str, str]:
+    """Build the PostgREST query-param dict for a filters mapping."""
+    return {key: _format_filter(value) for key, value in filters.items()}
+
+class _TableView:
+    """
+    Lightweight per-table proxy with the table name prebound.
+
+    Call-heavy code that hits the same few tables can hold one of these
+    and skip re-passing (and re-dispatching on) the table argument:
+    fetch/insert/update/upsert/delete are functools.partial variants of
+    the service methods with the table already applied.
+    """
+
+    __slots__ = ("name", "fetch", "fetch_iter", "insert",
+                 "update", "upsert", "delete")
+
+    def __init__(self, service: "SupabaseDatabaseService", name: str):
+        self.name = name
+        self.fetch = partial(service.fetch_data, name)
+        self.fetch_iter = partial(service.fetch_data_iter, name)
+        self.insert = partial(service.insert_data, name)
+        self.update = partial(service.update_data, name)
+        self.upsert = partial(service.upsert_data, name)
+        self.delete = partial(service.delete_data, name)
 
-from ._service import SupabaseService
 
 class SupabaseDatabaseService(SupabaseService):
     """
@@ -8,88 +166,272 @@ class SupabaseDatabaseService(SupabaseService):
     
     This class provides methods for database operations using Supabase's
     RESTful API for PostgreSQL.
+
+    Read methods accept an opt-in cache_ttl so repeated identical queries
+    are served from an in-process TTL+LRU cache instead of re-issuing the
+    HTTPS round trip; write methods invalidate cached reads for the table
+    they touch.
     """
-    
-    def fetch_data(self, 
-                  table: str, 
+
+    __slots__ = ("_response_cache", "_table_views")
+
+    # RPC names safe to serve from cache by default (no side effects);
+    # override or mutate on a subclass/instance to opt functions in
+    READONLY_RPCS: set = set()
+
+    # Tables whose reads are cached by default at the policy TTL from
+    # DEFAULT_TTLS; override or mutate to opt tables in, or pass cache_ttl
+    # per call for one-off control
+    CACHED_TABLES: set = set()
+
+    # Negative caching: empty result sets are cached for this many seconds
+    # at most, so pollers see newly created rows promptly while repeat
+    # misses within the window still skip the round trip
+    EMPTY_RESULT_TTL: float = 2.0
+
+    def __init__(self):
+        super().__init__()
+        self._response_cache = ResponseCache()
+        self._table_views: Dict[str, _TableView] = {}
+
+    def table(self, name: str) -> _TableView:
+        """
+        Return a cached per-table proxy with prebound CRUD methods.
+
+        Args:
+            name: Table name
+
+        Returns:
+            _TableView whose methods take the same arguments as the
+            service methods, minus the leading table name
+        """
+        view = self._table_views.get(name)
+        if view is None:
+            view = self._table_views[name] = _TableView(self, name)
+        return view
+
+    def fetch_data(self,
+                  table: str,
                   auth_token: Optional[str] = None,
-                  select: str = "*", 
+                  select: str = "*",
                   filters: Optional[Dict[str, Any]] = None,
                   order: Optional[str] = None,
                   limit: Optional[int] = None,
-                  offset: Optional[int] = None) -> List[Dict[str, Any]]:
+                  offset: Optional[int] = None,
+                  cache_ttl: Optional[float] = None,
+                  cache_swr: float = 0.0,
+                  row_type: Optional[type] = None) -> List[Any]:
         """
         Fetch data from a table with optional filtering, ordering, and pagination.
-        
+
+        The select clause supports PostgREST resource embedding, so related
+        rows can be fetched in the same round trip instead of issuing one
+        request per relation, e.g. select="*,director(*),cast(*)".
+
         Args:
             table: Table name
             auth_token: Optional JWT token for authenticated requests
-            select: Columns to select (default: "*")
+            select: Columns to select (default: "*"), including embedded
+                resources such as "*,related_table(*)"
             filters: Optional filters as dictionary
             order: Optional order by clause
             limit: Optional limit of rows to return
             offset: Optional offset for pagination
-            
+            cache_ttl: Optional seconds to cache the result in-process;
+                repeat queries within the TTL skip the network round trip
+            cache_swr: Optional stale-while-revalidate window in seconds;
+                after the TTL, stale results are still served for this long
+                while one background refresh re-fetches the query
+            row_type: Optional msgspec.Struct subclass; when given, rows are
+                decoded straight into typed instances (faster parse, less
+                memory than dicts), bypassing the response cache
+
         Returns:
-            List of rows as dictionaries
+            List of rows as dictionaries, or as row_type instances when
+            row_type is given
         """
         endpoint = f"/rest/v1/{table}"
         params = {"select": select}
-        
-        # Add filters if provided
+
+        # Opted-in tables cache at the volatility-based policy TTL unless
+        # the caller picked one explicitly
+        if cache_ttl is None and table in self.CACHED_TABLES:
+            cache_ttl = _ttl_for(endpoint)
+
+        # Add filters if provided, dispatching on value type
         if filters:
-            for key, value in filters.items():
-                # Format filter with eq operator for Supabase REST API
-                params[f"{key}"] = f"eq.{value}"
-                
+            params.update(_filter_params(filters))
+
         # Add ordering if provided
         if order:
             params["order"] = order
-            
+
         # Add pagination if provided
         if limit is not None:
             params["limit"] = limit
         if offset is not None:
             params["offset"] = offset
-            
-        return self._make_request(
-            method="GET",
-            endpoint=endpoint,
-            auth_token=auth_token,
-            params=params,
-            headers={"Prefer": "return=representation"}
-        )
+
+        if row_type is not None:
+            if msgspec is None:
+                raise ImportError(
+                    "Could not import 'msgspec'. Typed row decoding requires "
+                    "the msgspec package. Please install it using: pip install msgspec"
+                )
+            # Decode the raw body straight into typed structs; this skips
+            # both the intermediate dict representation and the cache
+            url = f"{self.base_url}{endpoint}"
+            headers = {**self._get_headers(auth_token), "Prefer": "return=representation"}
+            response = self._session.get(
+                url, headers=headers, params=params, timeout=DEFAULT_TIMEOUT
+            )
+            self._raise_for_error_response(response, url)
+            return msgspec.json.decode(response.content, type=List[row_type])
+
+        def load() -> List[Dict[str, Any]]:
+            return self._make_request(
+                method="GET",
+                endpoint=endpoint,
+                auth_token=auth_token,
+                params=params,
+                headers={"Prefer": "return=representation"}
+            )
+
+        if cache_ttl:
+            cache_key = ResponseCache.make_key(endpoint, params, auth_token)
+            return self._response_cache.get_or_refresh(
+                cache_key, load, ttl=cache_ttl, swr=cache_swr,
+                empty_ttl=min(cache_ttl, self.EMPTY_RESULT_TTL),
+            )
+
+        return load()
     
-    def insert_data(self, 
-                   table: str, 
-                   data: Union[Dict[str, Any], List[Dict[str, Any]]], 
+    def fetch_data_iter(self,
+                       table: str,
+                       auth_token: Optional[str] = None,
+                       select: str = "*",
+                       filters: Optional[Dict[str, Any]] = None,
+                       order: Optional[str] = None,
+                       limit: Optional[int] = None,
+                       offset: Optional[int] = None,
+                       timeout: int = 30) -> Iterator[Dict[str, Any]]:
+        """
+        Fetch data from a table as a lazy row iterator.
+
+        Streams the HTTP response instead of buffering the whole body, and
+        decodes rows incrementally when ijson is installed, so peak memory
+        for large result sets stays proportional to one row rather than the
+        full response. Without ijson the body is decoded in one pass but
+        rows are still yielded lazily.
+
+        Args:
+            table: Table name
+            auth_token: Optional JWT token for authenticated requests
+            select: Columns to select (default: "*")
+            filters: Optional filters as dictionary
+            order: Optional order by clause
+            limit: Optional limit of rows to return
+            offset: Optional offset for pagination
+            timeout: Request timeout in seconds
+
+        Yields:
+            Rows as dictionaries
+        """
+        params = {"select": select}
+
+        if filters:
+            params.update(_filter_params(filters))
+
+        if order:
+            params["order"] = order
+        if limit is not None:
+            params["limit"] = limit
+        if offset is not None:
+            params["offset"] = offset
+
+        url = f"{self.base_url}/rest/v1/{table}"
+        headers = {**self._get_headers(auth_token), "Prefer": "return=representation"}
+
+        with self._session.get(
+            url, headers=headers, params=params, stream=True, timeout=timeout
+        ) as response:
+            self._raise_for_error_response(response, url)
+
+            if ijson is not None:
+                # Incremental decode: rows come off the socket one at a
+                # time. requests only decompresses gzip/deflate bodies via
+                # content/iter_content, not .raw, so tell urllib3 to decode
+                # before ijson parses the stream.
+                response.raw.decode_content = True
+                yield from ijson.items(response.raw, "item")
+            else:
+                yield from response.json()
+
+    def insert_data(self,
+                   table: str,
+                   data: Union[Dict[str, Any], List[Dict[str, Any]]],
                    auth_token: Optional[str] = None,
-                   upsert: bool = False) -> List[Dict[str, Any]]:
+                   upsert: bool = False,
+                   batch_size: int = 500,
+                   max_concurrency: int = 8) -> List[Dict[str, Any]]:
         """
         Insert data into a table.
-        
+
+        Large record lists are split into size-bounded batches sent
+        concurrently, so N rows cost ceil(N / batch_size) overlapping
+        round trips instead of one oversized request (or N sequential
+        ones from a caller-side loop). Results are returned in input order.
+
         Args:
             table: Table name
             data: Data to insert (single record or list of records)
             auth_token: Optional JWT token for authenticated requests
             upsert: Whether to upsert (update on conflict)
-            
+            batch_size: Maximum records per request for list payloads
+            max_concurrency: Maximum batches in flight at once
+
         Returns:
             Inserted data
         """
         endpoint = f"/rest/v1/{table}"
         headers = {"Prefer": "return=representation"}
-        
+
         if upsert:
             headers["Prefer"] = "resolution=merge-duplicates,return=representation"
-            
-        return self._make_request(
+
+        if isinstance(data, list) and len(data) > batch_size:
+            chunks = [data[i:i + batch_size] for i in range(0, len(data), batch_size)]
+            results: List[Optional[List[Dict[str, Any]]]] = [None] * len(chunks)
+
+            with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+                futures = {
+                    executor.submit(
+                        self._make_request,
+                        method="POST",
+                        endpoint=endpoint,
+                        auth_token=auth_token,
+                        data=chunk,
+                        headers=headers,
+                    ): index
+                    for index, chunk in enumerate(chunks)
+                }
+                # Index results by submission order so output matches input
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+
+            self._response_cache.invalidate_prefix(endpoint + "|")
+            return list(itertools.chain.from_iterable(results))
+
+        result = self._make_request(
             method="POST",
             endpoint=endpoint,
             auth_token=auth_token,
             data=data,
             headers=headers
         )
+        # Writes make cached reads against this table stale
+        self._response_cache.invalidate_prefix(endpoint + "|")
+        return result
     
     def update_data(self, 
                    table: str, 
@@ -110,13 +452,12 @@ class SupabaseDatabaseService(SupabaseService):
         """
         endpoint = f"/rest/v1/{table}"
         params = {}
-        
-        # Format filters with eq operator for Supabase REST API
+
+        # Format filters for Supabase REST API, dispatching on value type
         if filters:
-            for key, value in filters.items():
-                params[f"{key}"] = f"eq.{value}"
-                
-        return self._make_request(
+            params.update(_filter_params(filters))
+
+        result = self._make_request(
             method="PATCH",
             endpoint=endpoint,
             auth_token=auth_token,
@@ -124,23 +465,40 @@ class SupabaseDatabaseService(SupabaseService):
             params=params,
             headers={"Prefer": "return=representation"}
         )
+        # Writes make cached reads against this table stale
+        self._response_cache.invalidate_prefix(endpoint + "|")
+        return result
     
-    def upsert_data(self, 
-                   table: str, 
-                   data: Union[Dict[str, Any], List[Dict[str, Any]]], 
-                   auth_token: Optional[str] = None) -> List[Dict[str, Any]]:
+    def upsert_data(self,
+                   table: str,
+                   data: Union[Dict[str, Any], List[Dict[str, Any]]],
+                   auth_token: Optional[str] = None,
+                   batch_size: int = 500,
+                   max_concurrency: int = 8) -> List[Dict[str, Any]]:
         """
         Upsert data in a table (insert or update).
-        
+
+        Large record lists are batched and sent concurrently, as in
+        insert_data.
+
         Args:
             table: Table name
             data: Data to upsert
             auth_token: Optional JWT token for authenticated requests
-            
+            batch_size: Maximum records per request for list payloads
+            max_concurrency: Maximum batches in flight at once
+
         Returns:
             Upserted data
         """
-        return self.insert_data(table, data, auth_token, upsert=True)
+        return self.insert_data(
+            table,
+            data,
+            auth_token,
+            upsert=True,
+            batch_size=batch_size,
+            max_concurrency=max_concurrency,
+        )
     
     def delete_data(self, 
                    table: str, 
@@ -159,90 +517,194 @@ class SupabaseDatabaseService(SupabaseService):
         """
         endpoint = f"/rest/v1/{table}"
         params = {}
-        
-        # Format filters with eq operator for Supabase REST API
+
+        # Format filters for Supabase REST API, dispatching on value type
+        # (iterable values collapse to one in.() filter)
         if filters:
-            for key, value in filters.items():
-                params[f"{key}"] = f"eq.{value}"
-                
-        return self._make_request(
+            params.update(_filter_params(filters))
+
+        result = self._make_request(
             method="DELETE",
             endpoint=endpoint,
             auth_token=auth_token,
             params=params,
             headers={"Prefer": "return=representation"}
         )
+        # Writes make cached reads against this table stale
+        self._response_cache.invalidate_prefix(endpoint + "|")
+        return result
     
-    def call_function(self, 
-                     function_name: str, 
+    def call_function(self,
+                     function_name: str,
                      params: Optional[Dict[str, Any]] = None,
-                     auth_token: Optional[str] = None) -> Any:
+                     auth_token: Optional[str] = None,
+                     cache_ttl: Optional[float] = None) -> Any:
         """
         Call a PostgreSQL function.
-        
+
+        Results are cached by (function, normalized params) when cache_ttl
+        is given, or for the cache's default TTL when the function is listed
+        in READONLY_RPCS. Pass cache_ttl=0 to force a fresh call for an
+        otherwise-cached function.
+
         Args:
             function_name: Function name
             params: Function parameters
             auth_token: Optional JWT token for authenticated requests
-            
+            cache_ttl: Optional seconds to cache the result in-process
+
         Returns:
             Function result
         """
         endpoint = f"/rest/v1/rpc/{function_name}"
-        
-        return self._make_request(
+
+        if cache_ttl is None and function_name in self.READONLY_RPCS:
+            cache_ttl = _ttl_for(endpoint) or self._response_cache.default_ttl_seconds
+
+        cache_key = None
+        if cache_ttl:
+            cache_key = ResponseCache.make_key(
+                endpoint, {"body": params or {}}, auth_token
+            )
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        result = self._make_request(
             method="POST",
             endpoint=endpoint,
             auth_token=auth_token,
             data=params or {}
         )
 
+        if cache_key is not None:
+            self._response_cache.set(cache_key, result, ttl=cache_ttl)
+
+        return result
+
+    def invalidate_rpc(self, function_name: str) -> int:
+        """
+        Drop cached results for a single RPC function.
+
+        Args:
+            function_name: Function name whose cached results to evict
+
+        Returns:
+            Number of cache entries removed
+        """
+        return self._response_cache.invalidate_prefix(
+            f"/rest/v1/rpc/{function_name}|"
+        )
+
+    def batch_operations(self,
+                        operations: List[Dict[str, Any]],
+                        auth_token: Optional[str] = None,
+                        is_admin: bool = False,
+                        function_name: str = "supabase_batch") -> List[Any]:
+        """
+        Execute multiple logical operations in a single Supabase round trip.
+
+        Packs the operation list into one PostgREST RPC call so callers that
+        need many lookups pay for a single HTTPS request instead of one per
+        operation. Requires a SQL function (default: supabase_batch) that
+        accepts a jsonb array of operations and returns a jsonb array of
+        per-operation results, e.g. via jsonb_agg.
+
+        Args:
+            operations: List of operation descriptors to pass to the function
+            auth_token: Optional JWT token for authenticated requests
+            is_admin: Whether to use the service role key (admin access)
+            function_name: Name of the batching SQL function
+
+        Returns:
+            List of per-operation results, in the same order as the input
+        """
+        return self._make_request(
+            method="POST",
+            endpoint=f"/rest/v1/rpc/{function_name}",
+            auth_token=auth_token,
+            is_admin=is_admin,
+            data={"operations": operations}
+        )
+
     def create_test_table(self,
                        table: str,
                        auth_token: Optional[str] = None,
                        is_admin: bool = True) -> Dict[str, Any]:
         """
         Create a simple test table for integration tests.
-        
+
+        Projects that deploy a create_standard_test_table(tname text)
+        stored procedure get the fast path: a tiny RPC body and a query
+        plan cached server-side, with no SQL string shipped per call.
+        When the procedure is absent (404) the method falls back to
+        rendering the DDL locally and running it through exec_sql.
+
         Args:
             table: Table name to create
             auth_token: Optional JWT token for authenticated requests
             is_admin: Whether to use service role key (admin access)
-            
+
         Returns:
             Response from the API
         """
-        # SQL to create a simple test table
-        sql = f"""
-        CREATE TABLE IF NOT EXISTS {table} (
-            id SERIAL PRIMARY KEY,
-            name TEXT NOT NULL,
-            description TEXT,
-            created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-            user_id TEXT
-        );
-        
-        -- Set up RLS policies
-        ALTER TABLE {table} ENABLE ROW LEVEL SECURITY;
-        
-        -- Create policy to allow all operations for authenticated users
-        DROP POLICY IF EXISTS "Allow all operations for authenticated users" ON {table};
-        CREATE POLICY "Allow all operations for authenticated users"
-        ON {table}
-        FOR ALL
-        TO authenticated
-        USING (true)
-        WITH CHECK (true);
-        """
-        
-        # Execute the SQL using the rpc endpoint
-        return self._make_request(
+        try:
+            return self._make_request(
+                method="POST",
+                endpoint="/rest/v1/rpc/create_standard_test_table",
+                auth_token=auth_token,
+                is_admin=is_admin,
+                data={"tname": _validate_identifier(table)}
+            )
+        except SupabaseAPIError as e:
+            # Fall back to inline DDL when the helper isn't deployed
+            if e.status_code != 404:
+                raise
+
+        # Render (or reuse) the validated DDL for this table name
+        sql = _render_create_sql(table)
+
+        # Execute the SQL using the rpc endpoint; blow away any cached
+        # exec_sql results since the schema just changed
+        result = self._make_request(
             method="POST",
             endpoint="/rest/v1/rpc/exec_sql",
             auth_token=auth_token,
             is_admin=is_admin,  # Must use admin privileges to create tables
             data={"query": sql}
         )
+        self.invalidate_rpc("exec_sql")
+        return result
+
+    def create_test_tables(self,
+                        tables: List[str],
+                        auth_token: Optional[str] = None,
+                        is_admin: bool = True) -> Dict[str, Any]:
+        """
+        Create several test tables in a single exec_sql round trip.
+
+        Concatenates the per-table DDL into one statement batch, so N
+        tables cost one RPC call instead of N.
+
+        Args:
+            tables: Table names to create
+            auth_token: Optional JWT token for authenticated requests
+            is_admin: Whether to use service role key (admin access)
+
+        Returns:
+            Response from the API
+        """
+        sql = "\n".join(_render_create_sql(table) for table in tables)
+
+        result = self._make_request(
+            method="POST",
+            endpoint="/rest/v1/rpc/exec_sql",
+            auth_token=auth_token,
+            is_admin=is_admin,
+            data={"query": sql}
+        )
+        self.invalidate_rpc("exec_sql")
+        return result
 
     def delete_table(self,
                     table: str,
@@ -250,23 +712,77 @@ class SupabaseDatabaseService(SupabaseService):
                     is_admin: bool = True) -> Dict[str, Any]:
         """
         Delete a table from the database.
-        
+
+        Prefers a deployed drop_test_table(tname text) stored procedure
+        (plan cached server-side, no SQL shipped per call) and falls back
+        to exec_sql when the procedure is absent.
+
         Args:
             table: Table name to delete
             auth_token: Optional JWT token for authenticated requests
             is_admin: Whether to use service role key (admin access)
-            
+
         Returns:
             Response from the API
         """
-        # SQL to drop the table
-        sql = f"DROP TABLE IF EXISTS {table};"
-        
-        # Execute the SQL using the rpc endpoint
-        return self._make_request(
+        try:
+            return self._make_request(
+                method="POST",
+                endpoint="/rest/v1/rpc/drop_test_table",
+                auth_token=auth_token,
+                is_admin=is_admin,
+                data={"tname": _validate_identifier(table)}
+            )
+        except SupabaseAPIError as e:
+            # Fall back to inline SQL when the helper isn't deployed
+            if e.status_code != 404:
+                raise
+
+        # SQL to drop the table; the name is validated first since it is
+        # interpolated into raw SQL
+        sql = f"DROP TABLE IF EXISTS {_validate_identifier(table)};"
+
+        # Execute the SQL using the rpc endpoint; blow away any cached
+        # exec_sql results since the schema just changed
+        result = self._make_request(
             method="POST",
             endpoint="/rest/v1/rpc/exec_sql",
             auth_token=auth_token,
             is_admin=is_admin,  # Must use admin privileges to delete tables
             data={"query": sql}
         )
+        self.invalidate_rpc("exec_sql")
+        return result
+
+    def delete_tables(self,
+                    tables: List[str],
+                    auth_token: Optional[str] = None,
+                    is_admin: bool = True) -> Dict[str, Any]:
+        """
+        Drop several tables in a single exec_sql round trip.
+
+        Counterpart to create_test_tables: one RPC call covers the whole
+        teardown list instead of one per table.
+
+        Args:
+            tables: Table names to drop
+            auth_token: Optional JWT token for authenticated requests
+            is_admin: Whether to use service role key (admin access)
+
+        Returns:
+            Response from the API
+        """
+        sql = " ".join(
+            f"DROP TABLE IF EXISTS {_validate_identifier(table)};"
+            for table in tables
+        )
+
+        result = self._make_request(
+            method="POST",
+            endpoint="/rest/v1/rpc/exec_sql",
+            auth_token=auth_token,
+            is_admin=is_admin,
+            data={"query": sql}
+        )
+        self.invalidate_rpc("exec_sql")
+        return result
@@ -9,7 +9,10 @@ class SupabaseEdgeFunctionsService(SupabaseService):
     This class provides methods for invoking Edge Functions deployed to Supabase.
     Note: Creating, listing, and deleting functions requires the Supabase CLI or Dashboard.
     """
-    
+
+    __slots__ = ()
+
+
     def invoke_function(self, 
                        function_name: str, 
                        invoke_method: str = "POST",
@@ -32,19 +35,17 @@ class SupabaseEdgeFunctionsService(SupabaseService):
             Function response
         """
         endpoint = f"/functions/v1/{function_name}"
-        
-        # Get default headers and merge with any additional headers
-        request_headers = self._get_headers(auth_token, is_admin)
-        if headers:
-            request_headers.update(headers)
-            
+
+        # _make_request builds the default headers itself (from the cached
+        # templates) and merges extras only when present, so just forward
+        # the caller's extra headers instead of pre-building a merged copy
         return self._make_request(
             method=invoke_method,
             endpoint=endpoint,
             auth_token=auth_token,
             is_admin=is_admin,
             data=body,
-            headers=request_headers
+            headers=headers
         )
     
     # Note: The following methods are placeholders that would normally require the Supabase Management API
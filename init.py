@@ -1,23 +1,13 @@
 from django.conf import settings
 import logging
-import sys
+import threading
 from backend.utils.sensitive import load_environment_files
 import os
 
 # Load environment variables
 load_environment_files()
 
-# Force Python to look for the supabase package in site-packages first
-# This prevents our local 'supabase' module from shadowing the installed library
-for path in sys.path:
-    if "site-packages" in path:
-        sys.path.insert(0, path)
-        break
-
-# Now import from the actual supabase-py library
-
 try:
-        # Try alternative import path (depending on how the package was installed)
     from supabase import create_client, Client
 except ImportError:
     raise ImportError(
@@ -30,6 +20,8 @@ logger = logging.getLogger(" apps.supabase_home")
 
 # Global variable to hold the Supabase client instance
 _supabase_client = None
+# Guards first-time initialization under threaded (ASGI/gunicorn) workers
+_init_lock = threading.Lock()
 
 
 def initialize_supabase() -> Client:
@@ -47,37 +39,40 @@ def initialize_supabase() -> Client:
     """
     global _supabase_client
 
-    # If client is already initialized, return it
+    # Double-checked locking: the fast path stays lock-free once the
+    # client exists, and concurrent first calls build exactly one client
     if _supabase_client is not None:
         return _supabase_client
 
-    # Check for required environment variables
-    supabase_url = os.getenv("SUPABASE_URL")
-    supabase_key = os.getenv("SUPABASE_ANON_KEY")
-
-    print(f"Supabase URL: {supabase_url}")  # Added print statement to show the URL
-
-    if not supabase_url:
-        error_msg = "SUPABASE_URL is not set in environment variables"
-        logger.error(error_msg)
-        raise ValueError(error_msg)
-
-    if not supabase_key:
-        error_msg = "SUPABASE_ANON_KEY is not set in environment variables"
-        logger.error(error_msg)
-        raise ValueError(error_msg)
-
-    # Log initialization (without sensitive info)
-    logger.info(f"Initializing Supabase client with URL: {supabase_url}")
-
-    try:
-        # Create the Supabase client
-        _supabase_client = create_client(supabase_url, supabase_key)
-        logger.info("Supabase client initialized successfully")
-        return _supabase_client
-    except Exception as e:
-        logger.exception(f"Failed to initialize Supabase client: {str(e)}")
-        raise
+    with _init_lock:
+        if _supabase_client is not None:
+            return _supabase_client
+
+        # Check for required environment variables
+        supabase_url = os.getenv("SUPABASE_URL")
+        supabase_key = os.getenv("SUPABASE_ANON_KEY")
+
+        if not supabase_url:
+            error_msg = "SUPABASE_URL is not set in environment variables"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        if not supabase_key:
+            error_msg = "SUPABASE_ANON_KEY is not set in environment variables"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        # Log initialization (without sensitive info)
+        logger.info("Initializing Supabase client with URL: %s", supabase_url)
+
+        try:
+            # Create the Supabase client
+            _supabase_client = create_client(supabase_url, supabase_key)
+            logger.info("Supabase client initialized successfully")
+            return _supabase_client
+        except Exception as e:
+            logger.exception("Failed to initialize Supabase client: %s", e)
+            raise
 
 
 def get_supabase_client() -> Client:
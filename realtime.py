@@ -1,17 +1,144 @@
+import logging
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, Optional
 
-from ._service import SupabaseService
+from ._service import SupabaseAuthError, SupabaseService
+
+logger = logging.getLogger(__name__)
+
+# Substrings that mark a channel-listing failure as a permissions issue
+# (used only when the exception carries no status code)
+_FORBIDDEN_TOKENS = ("403", "forbidden", "unauthorized")
+
+
+def _status_code(exc: Exception) -> Optional[int]:
+    """Extract an HTTP status code from an exception, if it carries one."""
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status
+
+
+def _is_forbidden(exc: Exception) -> bool:
+    """
+    Whether an exception represents a permissions (401/403) failure.
+
+    Prefers structured information - the service layer raises
+    SupabaseAuthError for 401/403 and SupabaseAPIError carries
+    status_code - and only falls back to scanning the message when no
+    status is attached, so the common classification skips formatting
+    the full exception string.
+    """
+    if isinstance(exc, SupabaseAuthError):
+        return True
+    status = _status_code(exc)
+    if status is not None:
+        return status in (401, 403)
+    return any(token in str(exc).lower() for token in _FORBIDDEN_TOKENS)
+
+# Static skeleton of the unsubscribe_all advisory response; the guidance
+# never changes, so each call copies this instead of rebuilding the
+# strings from fragments
+_UNSUBSCRIBE_ALL_BASE = {
+    "status": "warning",
+    "message": "Server-side channel management is not fully supported by Supabase Realtime API.",
+    "recommendation": (
+        "For client applications, use: await client.realtime.remove_all_channels() "
+        "instead of this server-side method."
+    ),
+    "rls_info": (
+        "Ensure your channel naming follows the required format for RLS: "
+        "'private-[schema]-[table]-[*|id]' and that proper RLS policies are in place."
+    ),
+}
+
+_PERMISSION_DENIED_DETAILS = (
+    "Permission denied (403) when accessing the unsubscribe_all endpoint. "
+    "This is expected behavior as Supabase restricts server-side management "
+    "of realtime channels."
+)
+
+_SQL_POLICY_BLOCK = """-- Recommended RLS policies for Supabase Realtime
+-- Run these in your Supabase SQL Editor
+
+-- Enable RLS on the realtime schema tables
+ALTER TABLE realtime.messages ENABLE ROW LEVEL SECURITY;
+
+-- Create policies for realtime messages
+CREATE POLICY "Allow authenticated users to select from realtime messages"
+ON realtime.messages
+FOR SELECT
+TO authenticated
+USING (true);
+
+CREATE POLICY "Allow authenticated users to insert into realtime messages"
+ON realtime.messages
+FOR INSERT
+TO authenticated
+WITH CHECK (true);
+
+-- Allow use of presence features
+CREATE POLICY "Allow authenticated users to use presence"
+ON realtime.presence
+FOR ALL
+TO authenticated
+USING (true);
+                    """
+
 
 class SupabaseRealtimeService(SupabaseService):
     """
     Service for interacting with Supabase Realtime API.
-    
+
     This class provides methods for managing Realtime subscriptions.
     Note: This is a server-side implementation and doesn't maintain websocket
     connections. For client-side realtime, use the Supabase JavaScript client.
+
+    Subscriptions made through this service are tracked in active_channels
+    (subscription ID -> subscription data) so unsubscribe_all can drain them
+    without querying the restricted server-side channel endpoints. The
+    registry is LRU-bounded at max_tracked_channels so a leaking caller
+    cannot grow it without limit; the least recently touched entry is
+    evicted (with a best-effort server unsubscribe) once over the cap.
     """
-    
-    def subscribe_to_channel(self, 
+
+    __slots__ = ("active_channels", "max_tracked_channels",
+                 "_channels_snapshot", "_snapshot_dirty",
+                 "_unsubscribe_all_403_at")
+
+    # How long to suppress retries of the server-side unsubscribe_all
+    # endpoint after it returns a permission error
+    UNSUBSCRIBE_ALL_BACKOFF: float = 60.0
+
+    def __init__(self, max_tracked_channels: int = 256):
+        super().__init__()
+        self.active_channels: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.max_tracked_channels = max_tracked_channels
+        # Immutable view of the tracked subscription IDs, rebuilt lazily
+        # only after the registry changes
+        self._channels_snapshot: tuple = ()
+        self._snapshot_dirty = False
+        # monotonic timestamp of the last 403 from unsubscribe_all, or
+        # None; lets repeated calls skip the round trip that is known to
+        # fail for a while instead of hammering a restricted endpoint
+        self._unsubscribe_all_403_at: Optional[float] = None
+
+    @property
+    def local_channels(self) -> tuple:
+        """
+        Immutable snapshot of the locally tracked subscription IDs.
+
+        Rebuilt only after subscribe/unsubscribe changes the registry, so
+        hot readers get the cached tuple instead of a fresh list per call.
+        """
+        if self._snapshot_dirty:
+            self._channels_snapshot = tuple(self.active_channels)
+            self._snapshot_dirty = False
+        return self._channels_snapshot
+
+    def subscribe_to_channel(self,
                            channel: str, 
                            event: str = "*",
                            auth_token: Optional[str] = None,
@@ -28,7 +155,7 @@ class SupabaseRealtimeService(SupabaseService):
         Returns:
             Subscription data
         """
-        return self._make_request(
+        result = self._make_request(
             method="POST",
             endpoint="/realtime/v1/subscribe",
             auth_token=auth_token,
@@ -41,6 +168,34 @@ class SupabaseRealtimeService(SupabaseService):
                 }
             }
         )
+        # Track the subscription locally so unsubscribe_all can drain it;
+        # re-subscribes count as recent use for the LRU bound
+        subscription_id = result.get("subscription_id", channel)
+        self.active_channels[subscription_id] = {
+            "channel": channel,
+            "event": event,
+            **result,
+        }
+        self.active_channels.move_to_end(subscription_id)
+        self._snapshot_dirty = True
+
+        # Evict the least recently used subscriptions once over the cap,
+        # telling the server best-effort so it can drop them too
+        while len(self.active_channels) > self.max_tracked_channels:
+            evicted_id, _ = self.active_channels.popitem(last=False)
+            try:
+                self._make_request(
+                    method="POST",
+                    endpoint="/realtime/v1/unsubscribe",
+                    auth_token=auth_token,
+                    is_admin=is_admin,
+                    data={"subscription_id": evicted_id}
+                )
+            except Exception:
+                # Eviction is a memory bound, not a delivery guarantee
+                pass
+
+        return result
     
     def unsubscribe_from_channel(self, 
                               subscription_id: str,
@@ -57,7 +212,7 @@ class SupabaseRealtimeService(SupabaseService):
         Returns:
             Success message
         """
-        return self._make_request(
+        result = self._make_request(
             method="POST",
             endpoint="/realtime/v1/unsubscribe",
             auth_token=auth_token,
@@ -66,6 +221,9 @@ class SupabaseRealtimeService(SupabaseService):
                 "subscription_id": subscription_id
             }
         )
+        if self.active_channels.pop(subscription_id, None) is not None:
+            self._snapshot_dirty = True
+        return result
     
     def unsubscribe_all(self, auth_token: Optional[str] = None, is_admin: bool = True) -> Dict[str, Any]:
         """
@@ -86,23 +244,63 @@ class SupabaseRealtimeService(SupabaseService):
         Returns:
             Success message or error details when API fails
         """
-        response = {
-            "status": "warning",
-            "message": "Server-side channel management is not fully supported by Supabase Realtime API."
-        }
-        
-        # Add recommendation for client-side approach
-        response["recommendation"] = (
-            "For client applications, use: await client.realtime.remove_all_channels() " +
-            "instead of this server-side method."
-        )
-        
-        # For RLS issues, add policy recommendations
-        response["rls_info"] = (
-            "Ensure your channel naming follows the required format for RLS: " +
-            "'private-[schema]-[table]-[*|id]' and that proper RLS policies are in place."
-        )
-        
+        response = _UNSUBSCRIBE_ALL_BASE.copy()
+
+        # Drain the locally tracked subscriptions first: swap the registry
+        # out atomically (it must stay an OrderedDict - subscribe_to_channel
+        # relies on move_to_end/popitem for LRU bookkeeping), then
+        # unsubscribe concurrently, collecting failures instead of letting
+        # one abort the rest of the cleanup
+        drained, self.active_channels = self.active_channels, OrderedDict()
+        self._snapshot_dirty = True
+        if drained:
+            errors = []
+
+            def unsubscribe(subscription_id: str) -> None:
+                try:
+                    self._make_request(
+                        method="POST",
+                        endpoint="/realtime/v1/unsubscribe",
+                        auth_token=auth_token,
+                        is_admin=is_admin,
+                        data={"subscription_id": subscription_id}
+                    )
+                except Exception as e:
+                    errors.append({"subscription_id": subscription_id, "error": str(e)})
+
+            with ThreadPoolExecutor(max_workers=min(8, len(drained))) as executor:
+                list(executor.map(unsubscribe, drained))
+
+            response["local_unsubscribed"] = len(drained) - len(errors)
+            if errors:
+                response["local_errors"] = errors
+
+        # The server endpoint is restricted to the service role in practice:
+        # without the admin key the round trip is guaranteed to fail, so skip
+        # it outright rather than paying for a doomed request
+        if not is_admin:
+            response["api_error"] = {
+                "status": "skipped",
+                "message": "Server-side unsubscribe_all not attempted without admin key.",
+            }
+            return response
+
+        # After a fresh 403 the endpoint will keep refusing for this
+        # deployment; back off instead of re-probing on every call (test
+        # suites in particular tend to call this in teardown storms)
+        if self._unsubscribe_all_403_at is not None:
+            if time.monotonic() - self._unsubscribe_all_403_at < self.UNSUBSCRIBE_ALL_BACKOFF:
+                response["api_error"] = {
+                    "status": "skipped",
+                    "message": (
+                        "Server-side unsubscribe_all recently returned 403; "
+                        "retry suppressed."
+                    ),
+                }
+                response["error_details"] = _PERMISSION_DENIED_DETAILS
+                return response
+            self._unsubscribe_all_403_at = None
+
         # Try the server API but don't expect success
         try:
             api_response = self._make_request(
@@ -124,41 +322,18 @@ class SupabaseRealtimeService(SupabaseService):
             }
             
             # Add status code if available
-            if hasattr(e, 'response') and hasattr(e.response, 'status_code'):
-                error_info["status_code"] = e.response.status_code
-                
-                # Special handling for 403 errors - expected for this endpoint
-                if e.response.status_code == 403:
-                    # This is normal - update status to warning
-                    response["error_details"] = "Permission denied (403) when accessing the unsubscribe_all endpoint. " +\
-                                              "This is expected behavior as Supabase restricts server-side management of realtime channels."
-                    response["sql_policy"] = """-- Recommended RLS policies for Supabase Realtime
--- Run these in your Supabase SQL Editor
-
--- Enable RLS on the realtime schema tables
-ALTER TABLE realtime.messages ENABLE ROW LEVEL SECURITY;
+            status = _status_code(e)
+            if status is not None:
+                error_info["status_code"] = status
 
--- Create policies for realtime messages
-CREATE POLICY "Allow authenticated users to select from realtime messages" 
-ON realtime.messages 
-FOR SELECT 
-TO authenticated 
-USING (true);
+            # Special handling for permission errors - expected here
+            if _is_forbidden(e):
+                # This is normal - keep the warning status, and remember the
+                # refusal so calls within the backoff window skip the retry
+                self._unsubscribe_all_403_at = time.monotonic()
+                response["error_details"] = _PERMISSION_DENIED_DETAILS
+                response["sql_policy"] = _SQL_POLICY_BLOCK
 
-CREATE POLICY "Allow authenticated users to insert into realtime messages" 
-ON realtime.messages 
-FOR INSERT 
-TO authenticated 
-WITH CHECK (true);
-
--- Allow use of presence features
-CREATE POLICY "Allow authenticated users to use presence" 
-ON realtime.presence 
-FOR ALL
-TO authenticated 
-USING (true);
-                    """
-                    
             response["api_error"] = error_info
             return response
     
@@ -196,18 +371,18 @@ USING (true);
         except Exception as e:
             # If this fails with a 403, it might be that the endpoint requires a specific format
             # or doesn't work with the current Supabase version
-            error_msg = str(e).lower()
-            if '403' in error_msg or 'forbidden' in error_msg or 'unauthorized' in error_msg:
+            if _is_forbidden(e):
                 # Log the issue
-                import logging
-                logger = logging.getLogger(__name__)
                 logger.warning(
                     "Could not access Realtime channels endpoint; " 
                     "this may be expected if your Supabase version doesn't support it. "
                     "Consider accessing client.realtime.channels directly instead."
                 )
-                # Return an empty channel list
-                return {"channels": [], "error": "API endpoint unavailable - use client-side methods"}
+                # Fall back to the locally tracked subscriptions
+                return {
+                    "channels": list(self.local_channels),
+                    "error": "API endpoint unavailable - returning locally tracked channels",
+                }
             else:
                 # For other errors, re-raise
                 raise
@@ -1,8 +1,116 @@
 from typing import Any, Dict, List, Optional, Union, BinaryIO, Tuple
+import base64
+import functools
+import hashlib
+import io
+import logging
+import mimetypes
 import os
+import tempfile
+import time
+from urllib.parse import quote
+
 import requests
 
-from ._service import SupabaseService
+from concurrent.futures import ThreadPoolExecutor
+
+from requests.adapters import HTTPAdapter
+
+from ._service import POOL_MAXSIZE, SupabaseAPIError, SupabaseService
+
+logger = logging.getLogger("apps.supabase_home")
+
+# Chunk size for streamed uploads, configurable via environment so
+# deployments can trade memory for fewer, larger writes
+_UPLOAD_CHUNK_SIZE = int(os.environ.get("SUPABASE_UPLOAD_CHUNK_SIZE_MB", "8")) * 1024 * 1024
+
+# Split (connect, read) timeouts for raw transfers: a scalar timeout
+# would kill a slow-but-flowing multi-GB transfer mid-stream. Connects
+# must still fail fast; uploads get no read deadline (they run as long
+# as bytes keep moving), downloads get a generous configurable one.
+_CONNECT_TIMEOUT = float(os.environ.get("SUPABASE_STORAGE_CONNECT_TIMEOUT", "10"))
+_UPLOAD_TIMEOUT = (_CONNECT_TIMEOUT, None)
+_DOWNLOAD_TIMEOUT = (
+    _CONNECT_TIMEOUT,
+    float(os.environ.get("SUPABASE_STORAGE_READ_TIMEOUT", "300")),
+)
+
+# Content types for the extensions we handle most often; anything else
+# falls through to mimetypes.guess_type
+_EXT_TO_MIME = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".pdf": "application/pdf",
+    ".txt": "text/plain",
+    ".md": "text/plain",
+    ".json": "application/json",
+}
+
+
+def _wrap_requests_errors(action: str):
+    """
+    Decorator translating transport failures into SupabaseAPIError.
+
+    The raw-session methods (uploads/downloads bypass _make_request, so
+    they don't get its error handling) previously duplicated the same
+    try/except/log/wrap block; this keeps their happy paths straight-line
+    and the error payload format in one place.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except requests.exceptions.RequestException as e:
+                logger.error("Error %s: %s", action, e)
+                response = getattr(e, "response", None)
+                error_details = {}
+                if response is not None:
+                    try:
+                        error_details = response.json()
+                    except ValueError:
+                        error_details = {
+                            "status": response.status_code,
+                            "text": response.text,
+                        }
+                raise SupabaseAPIError(
+                    message=f"Error {action}: {str(e)}",
+                    status_code=getattr(response, "status_code", None),
+                    details=error_details,
+                )
+        return wrapper
+    return decorator
+
+
+def _redact_headers(headers: Dict[str, str]) -> Dict[str, str]:
+    """Copy headers with credential values masked, safe for logging."""
+    return {
+        k: "<redacted>" if k.lower() in ("authorization", "apikey") else v
+        for k, v in headers.items()
+    }
+
+
+def _iter_file_chunks(file_data: BinaryIO, chunk_size: int = _UPLOAD_CHUNK_SIZE):
+    """
+    Yield fixed-size chunks from a file-like object.
+
+    Passing this generator as a request body makes requests use chunked
+    Transfer-Encoding, so uploads hold at most one chunk in memory
+    instead of the whole file.
+    """
+    while True:
+        chunk = file_data.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+def _hashing_iter(src, h):
+    """Yield chunks from src unchanged while feeding them to hasher h."""
+    for chunk in src:
+        h.update(chunk)
+        yield chunk
 
 
 class SupabaseStorageService(SupabaseService):
@@ -11,8 +119,49 @@ class SupabaseStorageService(SupabaseService):
 
     This class provides methods for managing buckets and files
     in Supabase Storage.
+
+    Bucket metadata is cached for BUCKET_CACHE_TTL seconds because the
+    hot consumers (get_public_url checking the public flag) re-read data
+    that essentially never changes; update_bucket and delete_bucket
+    invalidate the cached entry.
     """
 
+    __slots__ = ("_bucket_cache", "_list_verb", "_single_delete_supported",
+                 "_stream_session")
+
+    # Seconds a bucket metadata entry stays cached
+    BUCKET_CACHE_TTL: float = 60.0
+
+    def __init__(self):
+        super().__init__()
+        # bucket_id -> (cached_at_monotonic, bucket_data)
+        self._bucket_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        # HTTP verb the deployment's object-list endpoint accepts,
+        # learned on the first list_files call
+        self._list_verb: Optional[str] = None
+        # Whether single-object DELETE works here, learned the same way
+        self._single_delete_supported: Optional[bool] = None
+        # Generator bodies (chunked streaming uploads) must go through a
+        # session without the retrying adapter: urllib3 cannot rewind an
+        # exhausted iterator, so a status-forcelist retry would re-send
+        # it as an empty chunked body and silently truncate the object.
+        # Rewindable bodies (bytes, seekable files) keep using _session.
+        self._stream_session = requests.Session()
+        stream_adapter = HTTPAdapter(
+            pool_connections=4, pool_maxsize=POOL_MAXSIZE
+        )
+        self._stream_session.mount("https://", stream_adapter)
+        self._stream_session.mount("http://", stream_adapter)
+
+    def close(self) -> None:
+        """
+        Close both pooled HTTP sessions.
+
+        Call this on process teardown to release kept-alive connections.
+        """
+        super().close()
+        self._stream_session.close()
+
     def create_bucket(
         self,
         bucket_id: str,
@@ -50,9 +199,6 @@ class SupabaseStorageService(SupabaseService):
         if not is_admin:
             is_admin = True
 
-        # Ensure data is always a valid JSON body
-        data = data or {}
-
         return self._make_request(
             method="POST",
             endpoint="/storage/v1/bucket",
@@ -75,12 +221,30 @@ class SupabaseStorageService(SupabaseService):
         Returns:
             Bucket data
         """
-        return self._make_request(
+        cached = self._bucket_cache.get(bucket_id)
+        if cached is not None and time.monotonic() - cached[0] < self.BUCKET_CACHE_TTL:
+            return cached[1]
+
+        bucket = self._make_request(
             method="GET",
-            endpoint="/storage/v1/bucket/" + bucket_id,
+            endpoint=f"/storage/v1/bucket/{bucket_id}",
             auth_token=auth_token,
             is_admin=is_admin,
         )
+        self._bucket_cache[bucket_id] = (time.monotonic(), bucket)
+        return bucket
+
+    def invalidate_bucket(self, bucket_id: str) -> None:
+        """
+        Drop the cached metadata for a bucket.
+
+        Called automatically after update_bucket/delete_bucket; call it
+        manually if the bucket was changed out of band.
+
+        Args:
+            bucket_id: Bucket identifier
+        """
+        self._bucket_cache.pop(bucket_id, None)
 
     def list_buckets(
         self, auth_token: Optional[str] = None, is_admin: bool = False
@@ -134,12 +298,14 @@ class SupabaseStorageService(SupabaseService):
         if allowed_mime_types is not None:
             data["allowed_mime_types"] = allowed_mime_types
 
-        return self._make_request(
+        result = self._make_request(
             method="PUT",
-            endpoint="/storage/v1/bucket/" + bucket_id,
+            endpoint=f"/storage/v1/bucket/{bucket_id}",
             auth_token=auth_token,
             data=data,
         )
+        self.invalidate_bucket(bucket_id)
+        return result
 
     def delete_bucket(
         self, bucket_id: str, auth_token: Optional[str] = None, is_admin: bool = False
@@ -155,13 +321,14 @@ class SupabaseStorageService(SupabaseService):
         Returns:
             Success message
         """
-        return self._make_request(
+        result = self._make_request(
             method="DELETE",
-            endpoint="/storage/v1/bucket/" + bucket_id,
+            endpoint=f"/storage/v1/bucket/{bucket_id}",
             auth_token=auth_token,
             is_admin=is_admin,
-            data={},
         )
+        self.invalidate_bucket(bucket_id)
+        return result
 
     def empty_bucket(
         self, bucket_id: str, auth_token: Optional[str] = None
@@ -178,10 +345,11 @@ class SupabaseStorageService(SupabaseService):
         """
         return self._make_request(
             method="POST",
-            endpoint="/storage/v1/bucket/" + bucket_id + "/empty",
+            endpoint=f"/storage/v1/bucket/{bucket_id}/empty",
             auth_token=auth_token,
         )
 
+    @_wrap_requests_errors("uploading file")
     def upload_file(
         self,
         bucket_id: str,
@@ -190,6 +358,8 @@ class SupabaseStorageService(SupabaseService):
         content_type: Optional[str] = None,
         auth_token: Optional[str] = None,
         is_admin: bool = False,
+        timeout: Union[float, Tuple[float, Optional[float]], None] = None,
+        compute_md5: bool = False,
     ) -> Dict[str, Any]:
         """
         Upload a file to a bucket.
@@ -201,133 +371,404 @@ class SupabaseStorageService(SupabaseService):
             content_type: Optional content type
             auth_token: Optional JWT token for authenticated requests
             is_admin: Whether to use service role key (admin access)
+            timeout: Optional scalar or (connect, read) timeout; defaults
+                to a fast connect with no read deadline
+            compute_md5: Send a Content-MD5 header so the server can
+                verify the payload; hashed in a single pass over the data
 
         Returns:
             File data
         """
-        url = f"{self.base_url}/storage/v1/object/{bucket_id}/{path}"
+        url = f"{self.base_url}/storage/v1/object/{bucket_id}/{quote(path, safe='/')}"
+
+        # Get headers with authentication (copy the shared read-only mapping
+        # so we can set a per-upload Content-Type)
+        headers = dict(self._get_headers(auth_token, is_admin))
+
+        # Set content type from the provided value, the extension table,
+        # or a mimetypes guess (same logic download_file uses)
+        ext = os.path.splitext(path)[1].lower()
+        headers["Content-Type"] = (
+            content_type
+            or _EXT_TO_MIME.get(ext)
+            or mimetypes.guess_type(path)[0]
+            or "application/octet-stream"
+        )
 
-        # Get headers with authentication
-        headers = self._get_headers(auth_token, is_admin)
-        
-        # Set content type based on provided value or file extension
-        if content_type:
-            headers["Content-Type"] = content_type
+        # For file uploads, we need to use requests directly instead of _make_request
+        # because we're not sending JSON data
+        logger.info("Uploading file to %s/%s with content type: %s", bucket_id, path, headers.get('Content-Type'))
+        # Header dumps are debug-only: building the redacted copy and
+        # its repr is wasted work at INFO and above
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Headers: %s", _redact_headers(headers))
+
+        # File-like objects are streamed in fixed-size chunks (chunked
+        # Transfer-Encoding) so uploads never materialize the whole
+        # file in memory; bytes payloads are already in RAM and are
+        # sent as-is with a Content-Length
+        streaming = hasattr(file_data, "read")
+        if streaming:
+            body = _iter_file_chunks(file_data)
         else:
-            # Try to guess content type from file extension
-            _, ext = os.path.splitext(path)
-            if ext.lower() in [".jpg", ".jpeg"]:
-                headers["Content-Type"] = "image/jpeg"
-            elif ext.lower() == ".png":
-                headers["Content-Type"] = "image/png"
-            elif ext.lower() == ".pdf":
-                headers["Content-Type"] = "application/pdf"
-            elif ext.lower() in [".txt", ".md"]:
-                headers["Content-Type"] = "text/plain"
-            elif ext.lower() == ".json":
-                headers["Content-Type"] = "application/json"
+            body = file_data
+
+        if compute_md5:
+            # Content-MD5 must precede the body, so streamed sources are
+            # hashed while teeing into a spool (small files stay in
+            # memory, larger ones overflow to disk) and replayed from it:
+            # one pass over the bytes instead of hash-then-reread
+            digest = hashlib.md5()
+            if hasattr(file_data, "read"):
+                spool = tempfile.SpooledTemporaryFile(max_size=_UPLOAD_CHUNK_SIZE)
+                for chunk in _hashing_iter(body, digest):
+                    spool.write(chunk)
+                spool.seek(0)
+                body = _iter_file_chunks(spool)
             else:
-                headers["Content-Type"] = "application/octet-stream"
+                digest.update(file_data)
+            headers["Content-MD5"] = base64.b64encode(digest.digest()).decode()
+
+        # Generator bodies cannot survive an adapter-level retry (see
+        # _stream_session in __init__); bytes get the retrying session
+        session = self._stream_session if streaming else self._session
+        response = session.post(
+            url, headers=headers, data=body,
+            timeout=timeout if timeout is not None else _UPLOAD_TIMEOUT,
+        )
 
-        try:
-            # For file uploads, we need to use requests directly instead of _make_request
-            # because we're not sending JSON data
-            import logging
-            logger = logging.getLogger("apps.supabase_home")
-            logger.info(f"Uploading file to {bucket_id}/{path} with content type: {headers.get('Content-Type')}")
-            logger.info(f"Headers: {headers}")
-            
-            response = requests.post(url, headers=headers, data=file_data, timeout=30)
-            
-            # Log the response status and headers
-            logger.info(f"Upload response status: {response.status_code}")
-            logger.info(f"Upload response headers: {response.headers}")
-            
-            # Log the response content for debugging
-            if response.status_code >= 400:
-                logger.error(f"Upload error response: {response.text}")
-            
-            response.raise_for_status()
-            
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            # Log the error and re-raise with more context
-            import logging
-            logger = logging.getLogger("apps.supabase_home")
-            logger.error(f"Error uploading file to {bucket_id}/{path}: {str(e)}")
-            
-            # Log request details
-            logger.error(f"Request URL: {url}")
-            logger.error(f"Request headers: {headers}")
-            
-            from ._service import SupabaseAPIError
-            error_details = {}
-            if hasattr(e, "response") and e.response is not None:
-                try:
-                    error_details = e.response.json()
-                    logger.error(f"Error response JSON: {error_details}")
-                except ValueError:
-                    error_details = {"status": e.response.status_code, "text": e.response.text}
-                    logger.error(f"Error response text: {e.response.text}")
-            
-            raise SupabaseAPIError(
-                message=f"Error uploading file: {str(e)}",
-                status_code=getattr(e.response, "status_code", None) if hasattr(e, "response") else None,
-                details=error_details
+        # Log the response status; the full header dump is debug-only
+        logger.info("Upload response status: %s", response.status_code)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Upload response headers: %s", response.headers)
+
+        # Log the response content for debugging
+        if response.status_code >= 400:
+            logger.error("Upload error response: %s", response.text)
+
+        response.raise_for_status()
+
+        return response.json()
+
+    @_wrap_requests_errors("uploading file (resumable)")
+    def upload_file_resumable(
+        self,
+        bucket_id: str,
+        path: str,
+        file_data: Union[bytes, BinaryIO],
+        part_size: int = _UPLOAD_CHUNK_SIZE,
+        content_type: Optional[str] = None,
+        auth_token: Optional[str] = None,
+        is_admin: bool = False,
+        max_retries: int = 3,
+    ) -> Dict[str, Any]:
+        """
+        Upload a large file resumably via the TUS protocol.
+
+        Unlike upload_file's single POST, the payload is sent in
+        part_size chunks against /storage/v1/upload/resumable, so a
+        transfer that dies near the end retries only from the server's
+        acknowledged offset instead of restarting from zero. The source
+        must be bytes or a seekable binary file.
+
+        Args:
+            bucket_id: Bucket identifier
+            path: File path within the bucket
+            file_data: File data as bytes or a seekable file-like object
+            part_size: Bytes sent per chunk (default: upload chunk size)
+            content_type: Optional content type
+            auth_token: Optional JWT token for authenticated requests
+            is_admin: Whether to use service role key (admin access)
+            max_retries: Consecutive failures tolerated per chunk
+
+        Returns:
+            Dict with the uploaded path, bucket and byte size
+
+        Raises:
+            ValueError: If file_data is not bytes or seekable
+            SupabaseAPIError: If the upload cannot be completed
+        """
+        if isinstance(file_data, (bytes, bytearray)):
+            source = io.BytesIO(file_data)
+            total = len(file_data)
+        elif hasattr(file_data, "seek") and hasattr(file_data, "read"):
+            source = file_data
+            source.seek(0, os.SEEK_END)
+            total = source.tell()
+            source.seek(0)
+        else:
+            raise ValueError(
+                "Resumable uploads need bytes or a seekable file object"
             )
 
+        headers = dict(self._get_headers(auth_token, is_admin))
+        # TUS carries its own content type per PATCH; the JSON default
+        # from _get_headers must not leak into the creation request
+        headers.pop("Content-Type", None)
+        headers["Tus-Resumable"] = "1.0.0"
+
+        def b64(value: str) -> str:
+            return base64.b64encode(value.encode()).decode()
+
+        metadata = f"bucketName {b64(bucket_id)},objectName {b64(path)}"
+        if content_type:
+            metadata += f",contentType {b64(content_type)}"
+
+        # Step 1: create the upload session; the Location header is the
+        # chunk target and survives across retries
+        response = self._session.post(
+            f"{self.base_url}/storage/v1/upload/resumable",
+            headers={
+                **headers,
+                "Upload-Length": str(total),
+                "Upload-Metadata": metadata,
+            },
+            timeout=_UPLOAD_TIMEOUT,
+        )
+        response.raise_for_status()
+        upload_url = response.headers["Location"]
+        if upload_url.startswith("/"):
+            upload_url = self.base_url + upload_url
+
+        # Step 2: stream chunks, resuming from the server's acknowledged
+        # offset after any transient failure
+        offset = 0
+        failures = 0
+        while offset < total:
+            source.seek(offset)
+            chunk = source.read(part_size)
+            try:
+                patch = self._session.patch(
+                    upload_url,
+                    headers={
+                        **headers,
+                        "Upload-Offset": str(offset),
+                        "Content-Type": "application/offset+octet-stream",
+                    },
+                    data=chunk,
+                    timeout=_UPLOAD_TIMEOUT,
+                )
+                patch.raise_for_status()
+            except requests.exceptions.RequestException as e:
+                failures += 1
+                if failures > max_retries:
+                    raise
+                logger.warning(
+                    "Resumable upload chunk at offset %s failed (%s/%s): %s",
+                    offset, failures, max_retries, e,
+                )
+                # Ask the server how much actually landed and resume there
+                head = self._session.head(
+                    upload_url, headers=headers, timeout=_UPLOAD_TIMEOUT
+                )
+                if head.ok and "Upload-Offset" in head.headers:
+                    offset = int(head.headers["Upload-Offset"])
+                continue
+
+            offset = int(patch.headers.get("Upload-Offset", offset + len(chunk)))
+            failures = 0
+
+        logger.info(
+            "Resumable upload of %s/%s complete (%s bytes)", bucket_id, path, total
+        )
+        return {"bucket_id": bucket_id, "path": path, "size": total}
+
+    @_wrap_requests_errors("downloading file")
     def download_file(
-        self, bucket_id: str, path: str, auth_token: Optional[str] = None, is_admin: bool = False
-    ) -> Tuple[bytes, str]:
+        self,
+        bucket_id: str,
+        path: str,
+        auth_token: Optional[str] = None,
+        is_admin: bool = False,
+        dest: Optional[Union[BinaryIO, str]] = None,
+        chunk_size: int = 1 << 20,
+        timeout: Union[float, Tuple[float, Optional[float]], None] = None,
+    ) -> Tuple[Union[bytes, int], str]:
         """
         Download a file from a bucket.
 
+        The response is streamed in chunks rather than materialized via
+        response.content, so peak memory stays bounded by chunk_size when
+        writing to a destination.
+
         Args:
             bucket_id: Bucket identifier
             path: File path
             auth_token: Optional JWT token for authenticated requests
             is_admin: Whether to use admin privileges
+            dest: Optional destination - a writable binary file object or
+                a filesystem path; when omitted the content is returned
+            chunk_size: Size of streamed chunks in bytes
+            timeout: Optional scalar or (connect, read) timeout; defaults
+                to a fast connect with a generous read deadline
 
         Returns:
-            Tuple of (file_content, content_type)
+            Tuple of (file_content, content_type) when dest is None,
+            otherwise (bytes_written, content_type)
         """
-        try:
-            url = f"{self.base_url}/storage/v1/object/{bucket_id}/{path}"
-            headers = self._get_headers(auth_token, is_admin)
-            
-            # For file downloads, we need to use requests directly instead of _make_request
-            # because we want the raw response content
-            response = requests.get(url, headers=headers, timeout=30)
+        url = f"{self.base_url}/storage/v1/object/{bucket_id}/{quote(path, safe='/')}"
+        headers = self._get_headers(auth_token, is_admin)
+
+        # For file downloads, we need to use requests directly instead of _make_request
+        # because we want the raw response content
+        with self._session.get(
+            url, headers=headers, stream=True,
+            timeout=timeout if timeout is not None else _DOWNLOAD_TIMEOUT,
+        ) as response:
             response.raise_for_status()
-            
+
             # Get content type from response headers or guess from file extension
             content_type = response.headers.get('Content-Type')
             if not content_type:
-                import mimetypes
                 content_type, _ = mimetypes.guess_type(path)
                 if not content_type:
                     content_type = "application/octet-stream"
-            
-            return response.content, content_type
-        except requests.exceptions.RequestException as e:
-            # Log the error and re-raise with more context
-            import logging
-            logger = logging.getLogger("apps.supabase_home")
-            logger.error(f"Error downloading file from {bucket_id}/{path}: {str(e)}")
-            
-            from ._service import SupabaseAPIError
-            error_details = {}
-            if hasattr(e, "response") and e.response is not None:
-                try:
-                    error_details = e.response.json()
-                except ValueError:
-                    error_details = {"status": e.response.status_code, "text": e.response.text}
-            
-            raise SupabaseAPIError(
-                message=f"Error downloading file: {str(e)}",
-                status_code=getattr(e.response, "status_code", None) if hasattr(e, "response") else None,
-                details=error_details
-            )
+
+            if dest is None:
+                buffer = bytearray()
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    buffer.extend(chunk)
+                return bytes(buffer), content_type
+
+            if isinstance(dest, str):
+                bytes_written = 0
+                with open(dest, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        f.write(chunk)
+                        bytes_written += len(chunk)
+            else:
+                bytes_written = 0
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    dest.write(chunk)
+                    bytes_written += len(chunk)
+            return bytes_written, content_type
+
+    def download_file_iter(
+        self,
+        bucket_id: str,
+        path: str,
+        auth_token: Optional[str] = None,
+        is_admin: bool = False,
+        chunk_size: int = 1 << 20,
+    ):
+        """
+        Stream a file from a bucket as an iterator of byte chunks.
+
+        Unlike download_file this never accumulates the object, so the
+        caller can pipeline processing (hashing, re-uploading, proxying)
+        while bytes are still arriving.
+
+        Args:
+            bucket_id: Bucket identifier
+            path: File path
+            auth_token: Optional JWT token for authenticated requests
+            is_admin: Whether to use admin privileges
+            chunk_size: Size of streamed chunks in bytes
+
+        Yields:
+            Chunks of file content as bytes
+        """
+        url = f"{self.base_url}/storage/v1/object/{bucket_id}/{quote(path, safe='/')}"
+        headers = self._get_headers(auth_token, is_admin)
+        with self._session.get(
+            url, headers=headers, stream=True, timeout=_DOWNLOAD_TIMEOUT,
+        ) as response:
+            response.raise_for_status()
+            yield from response.iter_content(chunk_size=chunk_size)
+
+    def upload_many(
+        self,
+        bucket_id: str,
+        items: List[Dict[str, Any]],
+        max_concurrency: int = 8,
+        auth_token: Optional[str] = None,
+        is_admin: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Upload multiple files concurrently over the pooled session.
+
+        Uploads are independent I/O-bound requests, so running them on a
+        bounded thread pool overlaps the network round trips instead of
+        paying one full RTT per file in sequence. Failures are collected
+        per path rather than aborting the whole batch.
+
+        Args:
+            bucket_id: Bucket identifier
+            items: Dictionaries with "path", "file_data", and optionally
+                "content_type" keys
+            max_concurrency: Maximum uploads in flight at once
+            auth_token: Optional JWT token for authenticated requests
+            is_admin: Whether to use service role key (admin access)
+
+        Returns:
+            Dict with "successes" (path -> file data) and "failures"
+            (path -> error message)
+        """
+        successes: Dict[str, Any] = {}
+        failures: Dict[str, str] = {}
+
+        def upload(item: Dict[str, Any]) -> None:
+            file_path = item["path"]
+            try:
+                successes[file_path] = self.upload_file(
+                    bucket_id,
+                    file_path,
+                    item["file_data"],
+                    content_type=item.get("content_type"),
+                    auth_token=auth_token,
+                    is_admin=is_admin,
+                )
+            except Exception as e:
+                failures[file_path] = str(e)
+
+        if items:
+            with ThreadPoolExecutor(
+                max_workers=min(max_concurrency, len(items))
+            ) as executor:
+                list(executor.map(upload, items))
+
+        return {"successes": successes, "failures": failures}
+
+    def download_many(
+        self,
+        bucket_id: str,
+        paths: List[str],
+        max_concurrency: int = 8,
+        auth_token: Optional[str] = None,
+        is_admin: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Download multiple files concurrently over the pooled session.
+
+        Args:
+            bucket_id: Bucket identifier
+            paths: File paths to download
+            max_concurrency: Maximum downloads in flight at once
+            auth_token: Optional JWT token for authenticated requests
+            is_admin: Whether to use admin privileges
+
+        Returns:
+            Dict with "successes" (path -> (file_content, content_type))
+            and "failures" (path -> error message)
+        """
+        successes: Dict[str, Tuple[bytes, str]] = {}
+        failures: Dict[str, str] = {}
+
+        def download(file_path: str) -> None:
+            try:
+                successes[file_path] = self.download_file(
+                    bucket_id, file_path, auth_token=auth_token, is_admin=is_admin
+                )
+            except Exception as e:
+                failures[file_path] = str(e)
+
+        if paths:
+            with ThreadPoolExecutor(
+                max_workers=min(max_concurrency, len(paths))
+            ) as executor:
+                list(executor.map(download, paths))
+
+        return {"successes": successes, "failures": failures}
 
     def list_files(
         self,
@@ -354,45 +795,45 @@ class SupabaseStorageService(SupabaseService):
         Returns:
             List of files
         """
-        import logging
-        logger = logging.getLogger("apps.supabase_home")
-        logger.info(f"Listing files in bucket {bucket_id} with path prefix: {path}")
-        logger.info(f"Using admin access: {is_admin}")
-        
-        params = {"prefix": path, "limit": limit, "offset": offset}
-        logger.info(f"Request params: {params}")
+        logger.info("Listing files in bucket %s with path prefix: %s", bucket_id, path)
 
+        params = {"prefix": path, "limit": limit, "offset": offset}
         if sort_by:
             params["sort_by"] = sort_by
 
-        try:
-            result = self._make_request(
-                method="POST",
-                endpoint="/storage/v1/object/list/" + bucket_id,
+        def request(method: str) -> Dict[str, Any]:
+            return self._make_request(
+                method=method,
+                endpoint=f"/storage/v1/object/list/{bucket_id}",
                 auth_token=auth_token,
                 is_admin=is_admin,
-                data=params,
+                # GET carries the filters as query parameters, POST as a body
+                data=params if method == "POST" else None,
+                params=params if method == "GET" else None,
             )
-            logger.info(f"Successfully listed files in bucket {bucket_id}")
-            return result
-        except Exception as e:
-            logger.error(f"Error listing files in bucket {bucket_id}: {str(e)}")
-            # Check if we need to try a different endpoint or method
-            logger.info("Trying alternative endpoint for listing files")
-            try:
-                # Try GET method instead of POST
-                result = self._make_request(
-                    method="GET",
-                    endpoint="/storage/v1/object/list/" + bucket_id,
-                    auth_token=auth_token,
-                    is_admin=is_admin,
-                    params=params,  # Use params instead of data for GET request
-                )
-                logger.info("Successfully listed files using alternative endpoint")
-                return result
-            except Exception as alt_e:
-                logger.error(f"Alternative endpoint also failed: {str(alt_e)}")
+
+        # Dispatch straight to the verb this deployment accepts once it
+        # is known, instead of re-paying a failed POST round trip per call
+        if self._list_verb is not None:
+            return request(self._list_verb)
+
+        try:
+            result = request("POST")
+        except SupabaseAPIError as e:
+            # Only a missing/unsupported route means the deployment wants
+            # GET; auth or server errors should surface as-is
+            if e.status_code not in (404, 405):
                 raise
+            logger.info(
+                "POST object-list endpoint unavailable (%s), falling back to GET",
+                e.status_code,
+            )
+            result = request("GET")
+            self._list_verb = "GET"
+            return result
+        else:
+            self._list_verb = "POST"
+            return result
 
     def move_file(
         self,
@@ -475,43 +916,51 @@ class SupabaseStorageService(SupabaseService):
         Returns:
             Success message
         """
-        import logging
-        logger = logging.getLogger("apps.supabase_home.storage")
-        logger.info(f"Delete file called with bucket_id: {bucket_id}, paths: {paths}, path: {path}")
-        logger.info(f"Auth token available: {bool(auth_token)}, is_admin: {is_admin}")
+        logger.info("Delete file called with bucket_id: %s, paths: %s, path: %s", bucket_id, paths, path)
+        logger.info("Auth token available: %s, is_admin: %s", bool(auth_token), is_admin)
         
         # Handle both 'path' and 'paths' parameters for backward compatibility
         if path is not None and paths is None:
             paths = path
-            logger.info(f"Using path parameter: {path}")
+            logger.info("Using path parameter: %s", path)
             
         if isinstance(paths, str):
             paths = [paths]
-            logger.info(f"Converted string path to list: {paths}")
+            logger.info("Converted string path to list: %s", paths)
 
         # According to Supabase docs, the API expects a specific format
         # The key must be exactly 'prefixes' and it must be a list of strings
         request_data = {"prefixes": paths}
-        logger.info(f"Making request with data: {request_data}")
+        logger.info("Making request with data: %s", request_data)
 
         try:
-            # Try individual file deletion first if there's only one file
-            if len(paths) == 1 and paths[0]:
+            # Try individual file deletion first if there's only one file,
+            # unless we've already learned this deployment rejects the verb
+            if len(paths) == 1 and paths[0] and self._single_delete_supported is not False:
                 single_path = paths[0]
-                logger.info(f"Attempting single file deletion for: {single_path}")
+                logger.info("Attempting single file deletion for: %s", single_path)
                 try:
                     # Use DELETE method for single file deletion
                     result = self._make_request(
                         method="DELETE",
-                        endpoint=f"/storage/v1/object/{bucket_id}/{single_path.lstrip('/')}",
+                        endpoint=f"/storage/v1/object/{bucket_id}/{quote(single_path.lstrip('/'), safe='/')}",
                         auth_token=auth_token,
                         is_admin=is_admin
                     )
-                    logger.info(f"Single file deletion successful: {result}")
+                    self._single_delete_supported = True
+                    logger.info("Single file deletion successful: %s", result)
                     return result
                 except Exception as single_delete_error:
-                    logger.warning(f"Single file deletion failed, trying batch delete: {str(single_delete_error)}")
-            
+                    # Only 405 unambiguously means the verb is unsupported;
+                    # a 404 may just be a missing object, so don't memoize it
+                    if (
+                        isinstance(single_delete_error, SupabaseAPIError)
+                        and single_delete_error.status_code == 405
+                    ):
+                        self._single_delete_supported = False
+                    logger.warning("Single file deletion failed, trying batch delete: %s", single_delete_error)
+
+
             # Try batch deletion as fallback or for multiple files
             logger.info("Attempting batch deletion")
             result = self._make_request(
@@ -521,10 +970,10 @@ class SupabaseStorageService(SupabaseService):
                 is_admin=is_admin,
                 data=request_data,
             )
-            logger.info(f"Batch deletion successful: {result}")
+            logger.info("Batch deletion successful: %s", result)
             return result
         except Exception as e:
-            logger.error(f"Error in delete_file: {str(e)}")
+            logger.error("Error in delete_file: %s", e)
             logger.exception("Detailed exception information:")
             raise
 
@@ -549,7 +998,7 @@ class SupabaseStorageService(SupabaseService):
         """
         return self._make_request(
             method="POST",
-            endpoint="/storage/v1/object/sign/" + bucket_id + "/" + path,
+            endpoint=f"/storage/v1/object/sign/{bucket_id}/{quote(path, safe='/')}",
             auth_token=auth_token,
             data={"expiresIn": expires_in},
         )
@@ -575,7 +1024,7 @@ class SupabaseStorageService(SupabaseService):
         """
         return self._make_request(
             method="POST",
-            endpoint="/storage/v1/object/sign/" + bucket_id,
+            endpoint=f"/storage/v1/object/sign/{bucket_id}",
             auth_token=auth_token,
             data={"expiresIn": expires_in, "paths": paths},
         )
@@ -596,15 +1045,17 @@ class SupabaseStorageService(SupabaseService):
         """
         return self._make_request(
             method="POST",
-            endpoint="/storage/v1/object/upload/sign/" + bucket_id + "/" + path,
+            endpoint=f"/storage/v1/object/upload/sign/{bucket_id}/{quote(path, safe='/')}",
             auth_token=auth_token,
         )
 
+    @_wrap_requests_errors("uploading to signed URL")
     def upload_to_signed_url(
         self,
         signed_url: str,
         file_data: Union[bytes, BinaryIO],
         content_type: Optional[str] = None,
+        timeout: Union[float, Tuple[float, Optional[float]], None] = None,
     ) -> None:
         """
         Upload a file to a signed URL.
@@ -613,6 +1064,8 @@ class SupabaseStorageService(SupabaseService):
             signed_url: Signed URL for upload
             file_data: File data as bytes or file-like object
             content_type: MIME type of the file
+            timeout: Optional scalar or (connect, read) timeout; defaults
+                to a fast connect with no read deadline
 
         Returns:
             None
@@ -621,9 +1074,10 @@ class SupabaseStorageService(SupabaseService):
         if content_type:
             headers["Content-Type"] = content_type
 
-        import requests
-
-        response = requests.put(signed_url, headers=headers, data=file_data, timeout=30)  # Add 30-second timeout for security
+        response = self._session.put(
+            signed_url, headers=headers, data=file_data,
+            timeout=timeout if timeout is not None else _UPLOAD_TIMEOUT,
+        )
         response.raise_for_status()
 
     def get_public_url(self, bucket_id: str, path: str, auth_token: Optional[str] = None, is_admin: bool = False) -> str:
@@ -647,8 +1101,6 @@ class SupabaseStorageService(SupabaseService):
         except Exception as e:
             # If we can't verify the bucket is public, we'll still try to generate the URL
             # but log a warning
-            import logging
-            logger = logging.getLogger("apps.supabase_home")
-            logger.warning(f"Could not verify bucket {bucket_id} is public: {str(e)}")
+            logger.warning("Could not verify bucket %s is public: %s", bucket_id, e)
 
-        return f"{self.base_url}/storage/v1/object/public/{bucket_id}/{path}"
+        return f"{self.base_url}/storage/v1/object/public/{bucket_id}/{quote(path, safe='/')}"
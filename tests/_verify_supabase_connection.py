@@ -5,7 +5,8 @@ from django.conf import settings
 import logging
 import pytest
 from datetime import datetime
-import importlib.util
+from functools import lru_cache
+import importlib
 
 # Add the parent directory to the Python path
 # This is necessary to find the 'core' module
@@ -23,6 +24,7 @@ logging.basicConfig(
 logger = logging.getLogger("supabase_verification")
 
 
+@lru_cache(maxsize=1)
 def verify_supabase_settings():
     """Verify that all required Supabase settings are properly configured"""
     logger.info("Verifying Supabase settings...")
@@ -47,26 +49,21 @@ def verify_supabase_settings():
     return all_settings_present
 
 
+@lru_cache(maxsize=1)
 def verify_supabase_client_import():
     """Verify that the Supabase client can be imported"""
     logger.info("Verifying Supabase client import...")
 
     try:
-        # Try to import the client - using importlib to avoid unused import warnings
-        client_spec = importlib.util.find_spec('apps.supabase_home.init')
-        client_singleton_spec = importlib.util.find_spec('apps.supabase_home.client')
-        
-        if client_spec is not None:
-            logger.info("✓ Successfully imported get_supabase_client")
-        else:
-            logger.error("✗ Failed to find apps.supabase_home.init")
-            return False
-            
-        if client_singleton_spec is not None:
-            logger.info("✓ Successfully imported supabase client singleton")
-        else:
-            logger.error("✗ Failed to find apps.supabase_home.client")
-            return False
+        # Import the modules directly: find_spec walks every sys.path
+        # finder just to build a spec we'd throw away, while import_module
+        # proves importability and leaves the module cached in sys.modules
+        # for the initialization check that follows
+        importlib.import_module('apps.supabase_home.init')
+        logger.info("✓ Successfully imported get_supabase_client")
+
+        importlib.import_module('apps.supabase_home.client')
+        logger.info("✓ Successfully imported supabase client singleton")
 
         return True
     except ImportError as e:
@@ -77,6 +74,7 @@ def verify_supabase_client_import():
         return False
 
 
+@lru_cache(maxsize=1)
 def verify_supabase_client_initialization():
     """Verify that the Supabase client can be initialized"""
     logger.info("Verifying Supabase client initialization...")
@@ -89,13 +87,14 @@ def verify_supabase_client_initialization():
         client = get_supabase_client()
         logger.info("✓ Successfully initialized Supabase client")
 
-        # Check if we can access the client's auth property (just access, no need to store)
-        _ = client.auth
-        logger.info("✓ Successfully accessed client.auth")
+        # Probe the client surface without touching the network: building
+        # a query for a fake table can pre-fetch schema metadata in some
+        # client versions, which is a wasted round trip per test startup
+        assert getattr(client, "auth", None) is not None
+        logger.info("✓ client.auth is available")
 
-        # Check if we can access the client's table method (just access, no need to store)
-        _ = client.table("non_existent_table")
-        logger.info("✓ Successfully accessed client.table method")
+        assert callable(getattr(client, "table", None))
+        logger.info("✓ client.table is callable (no network call made)")
 
         return True
     except Exception as e:
@@ -103,6 +102,7 @@ def verify_supabase_client_initialization():
         return False
 
 
+@lru_cache(maxsize=1)
 def verify_supabase_services():
     """Verify that the Supabase services can be accessed"""
     logger.info("Verifying Supabase services...")
@@ -129,6 +129,14 @@ def verify_supabase_services():
         return False
 
 
+def _reset_verification_cache():
+    """Clear memoized verification results for tests that re-verify."""
+    verify_supabase_settings.cache_clear()
+    verify_supabase_client_import.cache_clear()
+    verify_supabase_client_initialization.cache_clear()
+    verify_supabase_services.cache_clear()
+
+
 def run_verification():
     """Run all verification steps"""
     logger.info("Starting Supabase verification at " + datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
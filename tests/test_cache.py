@@ -0,0 +1,250 @@
+import threading
+import time
+
+import pytest
+
+from apps.supabase_home._cache import MemoryStore, ResponseCache
+
+
+class TestMemoryStore:
+    """Tests for the in-process TTL + LRU store"""
+
+    def test_get_returns_stored_bytes(self):
+        """Test that a stored value comes back before its TTL elapses"""
+        store = MemoryStore()
+        store.set("key", b"payload", ttl=30)
+
+        assert store.get("key") == b"payload"
+
+    def test_get_miss_returns_none(self):
+        """Test that an unknown key is a miss"""
+        store = MemoryStore()
+
+        assert store.get("missing") is None
+
+    def test_entries_expire_after_ttl(self):
+        """Test that entries are dropped once their TTL elapses"""
+        store = MemoryStore()
+        store.set("key", b"payload", ttl=0.01)
+
+        time.sleep(0.02)
+        assert store.get("key") is None
+
+    def test_lru_eviction_at_max_size(self):
+        """Test that the least recently used entry is evicted when full"""
+        store = MemoryStore(max_size=2)
+        store.set("a", b"1", ttl=30)
+        store.set("b", b"2", ttl=30)
+        store.set("c", b"3", ttl=30)
+
+        assert store.get("a") is None
+        assert store.get("b") == b"2"
+        assert store.get("c") == b"3"
+
+    def test_get_refreshes_lru_position(self):
+        """Test that reading an entry protects it from the next eviction"""
+        store = MemoryStore(max_size=2)
+        store.set("a", b"1", ttl=30)
+        store.set("b", b"2", ttl=30)
+
+        # Touch "a" so "b" becomes the eviction candidate
+        store.get("a")
+        store.set("c", b"3", ttl=30)
+
+        assert store.get("a") == b"1"
+        assert store.get("b") is None
+
+    def test_invalidate_prefix(self):
+        """Test that prefix invalidation removes only matching keys"""
+        store = MemoryStore()
+        store.set("/rest/v1/items|aa", b"1", ttl=30)
+        store.set("/rest/v1/items|bb", b"2", ttl=30)
+        store.set("/rest/v1/other|cc", b"3", ttl=30)
+
+        removed = store.invalidate_prefix("/rest/v1/items")
+
+        assert removed == 2
+        assert store.get("/rest/v1/items|aa") is None
+        assert store.get("/rest/v1/other|cc") == b"3"
+
+    def test_clear(self):
+        """Test that clear drops every entry"""
+        store = MemoryStore()
+        store.set("a", b"1", ttl=30)
+        store.clear()
+
+        assert store.get("a") is None
+
+
+class TestMakeKey:
+    """Tests for the cache key derivation"""
+
+    def test_key_is_stable_across_param_order(self):
+        """Test that param insertion order does not change the key"""
+        key1 = ResponseCache.make_key("/rest/v1/items", {"a": 1, "b": 2})
+        key2 = ResponseCache.make_key("/rest/v1/items", {"b": 2, "a": 1})
+
+        assert key1 == key2
+
+    def test_key_varies_with_request_shape(self):
+        """Test that endpoint, params, token and admin mode all distinguish keys"""
+        base = ResponseCache.make_key("/rest/v1/items", {"a": 1})
+
+        assert ResponseCache.make_key("/rest/v1/other", {"a": 1}) != base
+        assert ResponseCache.make_key("/rest/v1/items", {"a": 2}) != base
+        assert ResponseCache.make_key("/rest/v1/items", {"a": 1}, auth_token="t") != base
+        assert ResponseCache.make_key("/rest/v1/items", {"a": 1}, is_admin=True) != base
+
+    def test_key_starts_with_endpoint(self):
+        """Test that keys are prefixed so invalidate_prefix can match by table"""
+        key = ResponseCache.make_key("/rest/v1/items", {"a": 1})
+
+        assert key.startswith("/rest/v1/items|")
+
+    def test_auth_token_is_not_embedded(self):
+        """Test that the plaintext token never appears in the key"""
+        token = "super-secret-jwt"
+        key = ResponseCache.make_key("/rest/v1/items", auth_token=token)
+
+        assert token not in key
+
+
+class TestResponseCache:
+    """Tests for the TTL response cache over the memory store"""
+
+    @pytest.fixture
+    def cache(self):
+        """Create a cache backed by an explicit in-process store"""
+        return ResponseCache(store=MemoryStore())
+
+    def test_set_get_round_trip(self, cache):
+        """Test that a stored payload is returned on hit"""
+        cache.set("key", [{"id": 1}], ttl=30)
+
+        assert cache.get("key") == [{"id": 1}]
+        assert cache.hits == 1
+
+    def test_miss_counts_and_returns_none(self, cache):
+        """Test that a miss returns None and increments the counter"""
+        assert cache.get("missing") is None
+        assert cache.misses == 1
+
+    def test_hit_returns_fresh_copy(self, cache):
+        """Test that mutating a returned payload does not poison the cache"""
+        cache.set("key", {"rows": [1, 2]}, ttl=30)
+
+        first = cache.get("key")
+        first["rows"].append(3)
+
+        assert cache.get("key") == {"rows": [1, 2]}
+
+    def test_entries_expire_after_ttl(self, cache):
+        """Test that expired entries are misses"""
+        cache.set("key", "value", ttl=0.01)
+
+        time.sleep(0.02)
+        assert cache.get("key") is None
+
+    def test_empty_ttl_shortens_negative_results(self, cache):
+        """Test that falsy payloads use the shorter negative-result TTL"""
+        cache.set("key", [], ttl=30, empty_ttl=0.01)
+
+        assert cache.get("key") == []
+        time.sleep(0.02)
+        assert cache.get("key") is None
+
+    def test_get_or_refresh_loads_on_miss(self, cache):
+        """Test that a miss runs the loader synchronously and caches it"""
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return "fresh"
+
+        assert cache.get_or_refresh("key", loader, ttl=30) == "fresh"
+        assert cache.get_or_refresh("key", loader, ttl=30) == "fresh"
+        assert len(calls) == 1
+
+    def test_get_or_refresh_serves_stale_within_swr(self, cache):
+        """Test that a stale entry is served while a background refresh runs"""
+        cache.set("key", "stale", ttl=0.01, swr=30)
+        time.sleep(0.02)
+
+        refreshed = threading.Event()
+
+        def loader():
+            refreshed.set()
+            return "fresh"
+
+        # Stale-but-within-swr entries are served immediately
+        assert cache.get_or_refresh("key", loader, ttl=30, swr=30) == "stale"
+        assert refreshed.wait(timeout=2)
+
+        # Once the background refresh lands, hits see the new value
+        for _ in range(50):
+            if cache.get("key") == "fresh":
+                break
+            time.sleep(0.01)
+        assert cache.get("key") == "fresh"
+
+    def test_concurrent_misses_coalesce_to_one_load(self, cache):
+        """Test that N concurrent misses for one key cost one loader call"""
+        calls = []
+        release = threading.Event()
+
+        def loader():
+            calls.append(1)
+            release.wait(timeout=2)
+            return "value"
+
+        results = []
+
+        def worker():
+            results.append(cache.get_or_refresh("key", loader, ttl=30))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        time.sleep(0.05)
+        release.set()
+        for t in threads:
+            t.join(timeout=2)
+
+        assert len(calls) == 1
+        assert results == ["value"] * 4
+
+    def test_loader_exception_propagates_and_is_not_cached(self, cache):
+        """Test that a failing loader raises and the next call retries"""
+        def failing_loader():
+            raise RuntimeError("origin down")
+
+        with pytest.raises(RuntimeError):
+            cache.get_or_refresh("key", failing_loader, ttl=30)
+
+        assert cache.get_or_refresh("key", lambda: "recovered", ttl=30) == "recovered"
+
+    def test_invalidate_prefix_evicts_matching_entries(self, cache):
+        """Test that write paths can evict reads against one endpoint"""
+        key = ResponseCache.make_key("/rest/v1/items", {"a": 1})
+        other = ResponseCache.make_key("/rest/v1/other", {"a": 1})
+        cache.set(key, "items", ttl=30)
+        cache.set(other, "other", ttl=30)
+
+        removed = cache.invalidate_prefix("/rest/v1/items")
+
+        assert removed == 1
+        assert cache.get(key) is None
+        assert cache.get(other) == "other"
+
+    def test_clear_resets_counters(self, cache):
+        """Test that clear drops entries and zeroes the hit/miss counters"""
+        cache.set("key", "value", ttl=30)
+        cache.get("key")
+        cache.get("missing")
+
+        cache.clear()
+
+        assert cache.get("key") is None
+        assert cache.hits == 0
+        # The post-clear lookup above is itself a miss
+        assert cache.misses == 1